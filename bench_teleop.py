@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = [
+#   "bbos",
+#   "fastapi",
+#   "uvicorn",
+#   "wsproto",
+#   "websockets",
+#   "opencv-python",
+#   "numpy",
+#   "aiortc",
+#   "av",
+# ]
+# [tool.uv.sources]
+# bbos = { path = "/home/bracketbot/BracketBotOS", editable = true }
+# ///
+"""Benchmark: teleop joystick latency, from a /ws command to its drive.ctrl write.
+
+Starts teleop.py in its own process and sends JSON joystick commands at
+COMMAND_HZ, first with no other client and then with a /feed client pulling
+JPEGs. A Reader on drive.ctrl in this process timestamps each write, so this
+needs the robot's bbos and camera running. Every command sets a distinct
+turn rate of at most 0.3 * SPEED_ANG, so lift the wheels off the ground.
+
+Both teleop layouts are supported: the older one, where a single
+reader_loop thread reads the camera, encodes the JPEG and writes
+drive.ctrl, and the current control_loop and encode_loop threads. To
+compare them, run once as is and once with the path of a teleop.py from
+before the threads were split, saved from the git history:
+
+    ./bench_teleop.py /tmp/teleop_single_thread.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import urllib.request
+import numpy as np
+import websockets
+
+from bbos import Reader
+
+PORT = 8018
+COMMANDS = 300  # commands per run
+COMMAND_HZ = 50
+TELEOP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'teleop.py')
+
+def load_teleop(path: str):
+    spec = importlib.util.spec_from_file_location('teleop', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def serve(path: str) -> None:
+    teleop = load_teleop(path)
+    if hasattr(teleop, 'reader_loop'):
+        loops = [teleop.reader_loop]
+    else:
+        loops = [teleop.control_loop, teleop.encode_loop]
+    for loop in loops:
+        threading.Thread(target=loop, daemon=True).start()
+    teleop.server(PORT)
+
+def wait_until_up(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{PORT}/")
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+def watch_writes(writes: list, stop: threading.Event) -> None:
+    """Append (monotonic time, turn rate) for every drive.ctrl record."""
+    with Reader('drive.ctrl') as r_ctrl:
+        while not stop.is_set():
+            if r_ctrl.ready():
+                writes.append((time.monotonic(), float(r_ctrl.data['twist'][1])))
+            else:
+                time.sleep(0.0001)
+
+def feed_client(stop: threading.Event) -> None:
+    with urllib.request.urlopen(f"http://localhost:{PORT}/feed") as feed:
+        while not stop.is_set():
+            feed.read(65536)
+
+async def measure(speed_ang: float, with_feed: bool) -> list:
+    """Latency in ms of every command that reached drive.ctrl."""
+    stop = threading.Event()
+    writes = []
+    threads = [threading.Thread(target=watch_writes, args=(writes, stop), daemon=True)]
+    if with_feed:
+        threads.append(threading.Thread(target=feed_client, args=(stop,), daemon=True))
+    for thread in threads:
+        thread.start()
+    await asyncio.sleep(1.0)  # let the reader open and the feed settle
+    sent = {}  # turn rate as written (float32) -> when its command was sent
+    async with websockets.connect(f"ws://localhost:{PORT}/ws") as ws:
+        for k in range(1, COMMANDS + 1):
+            x = 0.3 * k / COMMANDS
+            sent[float(np.float32(x * speed_ang))] = time.monotonic()
+            await ws.send(json.dumps({'x': x, 'y': 0}))
+            await asyncio.sleep(1.0 / COMMAND_HZ)
+        await ws.send(json.dumps({'x': 0, 'y': 0}))
+        await asyncio.sleep(0.5)
+    stop.set()
+    latencies = []
+    for written, rate in writes:
+        sent_at = sent.pop(rate, None)
+        if sent_at is not None:
+            latencies.append((written - sent_at) * 1e3)
+    return latencies
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else TELEOP
+    teleop = load_teleop(path)
+    layout = 'single thread' if hasattr(teleop, 'reader_loop') else 'split threads'
+    print(f"{os.path.abspath(path)}: {layout}")
+    print(f"{'clients':<12}{'written':>8}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}   (latencies in ms)")
+    process = multiprocessing.Process(target=serve, args=(path,))
+    process.start()
+    try:
+        wait_until_up()
+        for with_feed in (False, True):
+            latencies = asyncio.run(measure(teleop.SPEED_ANG, with_feed))
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            print(f"{'/ws + /feed' if with_feed else '/ws':<12}{len(latencies):>8}{p50:>8.2f}{p90:>8.2f}"
+                  f"{p99:>8.2f}{max(latencies):>8.2f}")
+    finally:
+        process.terminate()
+        process.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = [
+#   "bbos",
+#   "fastapi",
+#   "uvicorn",
+#   "wsproto",
+#   "opencv-python",
+#   "numpy",
+#   "aiortc",
+#   "av",
+# ]
+# [tool.uv.sources]
+# bbos = { path = "/home/bracketbot/BracketBotOS", editable = true }
+# ///
+"""End to end check of teleop's WebRTC path with a local aiortc peer.
+
+Starts teleop.py in its own process, negotiates through /offer like the
+page does (host candidates only, no STUN), then receives the camera track
+for DURATION seconds while sending binary joystick commands on the data
+channel. Prints the video rate and size and the command round trip, from
+send to the FRAME_ACK that teleop returns once the command is written to
+drive.ctrl. Needs the robot's bbos and camera running; commands turn the
+robot slowly, so lift the wheels off the ground.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import threading
+import time
+import urllib.error
+import urllib.request
+import numpy as np
+from aiortc import RTCConfiguration, RTCPeerConnection, RTCSessionDescription
+
+import teleop
+from teleop import COMMAND_FRAME, FRAME_ACK, FRAME_COMMAND, PING_FRAME
+
+PORT = 8028
+DURATION = 5.0  # seconds of video and commands
+COMMAND_HZ = 50
+
+def serve() -> None:
+    for loop in (teleop.control_loop, teleop.encode_loop):
+        threading.Thread(target=loop, daemon=True).start()
+    teleop.server(PORT)
+
+def post_offer(offer: dict, timeout: float = 10.0) -> dict:
+    """POST the offer to /offer, retrying until teleop is up."""
+    deadline = time.monotonic() + timeout
+    request = urllib.request.Request(f"http://localhost:{PORT}/offer", data=json.dumps(offer).encode(),
+                                     headers={"Content-Type": "application/json"})
+    while True:
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+        except urllib.error.URLError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+async def measure() -> dict:
+    pc = RTCPeerConnection(RTCConfiguration(iceServers=[]))
+    pc.addTransceiver("video", direction="recvonly")
+    channel = pc.createDataChannel("joystick")
+    opened = asyncio.Event()
+    channel.on("open", opened.set)
+    tracks = asyncio.Queue()
+    pc.on("track", tracks.put_nowait)
+    sent = {}  # seq -> when its command was sent
+    acked = []  # round trips in ms
+
+    @channel.on("message")
+    def on_message(message):
+        if isinstance(message, bytes) and message[:1] == bytes([FRAME_ACK]):
+            _, seq, _ = PING_FRAME.unpack(message)
+            if seq in sent:
+                acked.append((time.monotonic() - sent.pop(seq)) * 1e3)
+
+    async def drive():
+        seq = 0
+        while True:
+            seq += 1
+            sent[seq] = time.monotonic()
+            channel.send(COMMAND_FRAME.pack(FRAME_COMMAND, seq, time.time() * 1e3, 0.3 * (seq % 10) / 10, 0))
+            await asyncio.sleep(1.0 / COMMAND_HZ)
+
+    try:
+        await pc.setLocalDescription(await pc.createOffer())
+        offer = {"sdp": pc.localDescription.sdp, "type": pc.localDescription.type}
+        await pc.setRemoteDescription(RTCSessionDescription(**await asyncio.to_thread(post_offer, offer)))
+        track = await asyncio.wait_for(tracks.get(), 10)
+        await asyncio.wait_for(opened.wait(), 10)
+        frame = await asyncio.wait_for(track.recv(), 10)  # first frame, not counted
+        driver = asyncio.create_task(drive())
+        frames = 0
+        start = time.monotonic()
+        while time.monotonic() - start < DURATION:
+            frame = await asyncio.wait_for(track.recv(), 5)
+            frames += 1
+        elapsed = time.monotonic() - start
+        driver.cancel()
+        channel.send(COMMAND_FRAME.pack(FRAME_COMMAND, 0, time.time() * 1e3, 0, 0))
+        await asyncio.sleep(0.5)
+    finally:
+        await pc.close()
+    return {'fps': frames / elapsed, 'size': (frame.width, frame.height), 'commands': len(acked) + len(sent),
+            'acked': acked}
+
+def main() -> None:
+    process = multiprocessing.Process(target=serve)
+    process.start()
+    try:
+        r = asyncio.run(measure())
+    finally:
+        process.terminate()
+        process.join()
+    print(f"video: {r['fps']:.1f} fps at {r['size'][0]}x{r['size'][1]}")
+    if not r['acked']:
+        print(f"commands: none of {r['commands']} acknowledged")
+        return
+    p50, p99 = np.percentile(r['acked'], [50, 99])
+    print(f"commands: {len(r['acked'])} of {r['commands']} acknowledged, "
+          f"round trip p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {max(r['acked']):.2f} ms")
+
+if __name__ == "__main__":
+    main()
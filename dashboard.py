@@ -5,25 +5,50 @@
 #   "uvicorn",
 #   "wsproto",
 #   "httpx",
+#   "psutil",
 # ]
 # [tool.uv.sources]
 # bbos = { path = "/home/bracketbot/BracketBotOS", editable = true }
 # ///
 import asyncio
 import json
+import os
 import signal
 import socket
 import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Dict, List, Optional, Set
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 import uvicorn
 import httpx
+import psutil
 
 from bbos.app_manager import get_status, start_app, stop_app
 
 REFRESH_TIME: float = 2.0  # seconds
-PORT_SCAN_RANGE = range(8000, 8010)  # Scan ports 8000-8009
+TITLE_RETRY: float = 10.0  # seconds before refetching a title that failed
+RESOURCE_INTERVAL: float = 2.0  # seconds between app resource samples
+RESOURCE_HISTORY = 60  # samples kept per app for the sparklines
+RESOURCE_RESCAN: float = 10.0  # seconds between re-listing an app's process tree
+READY_POLL: float = 0.1  # seconds between readiness checks of a starting app
+READY_TIMEOUT: float = 120.0  # seconds before giving up on a starting app
+STARTUP_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)  # upper bounds of the cold-start histogram, seconds
+
+def parse_ports(spec: str) -> Set[int]:
+    """Ports from a spec like "8000-8999,5000"."""
+    ports = set()
+    for part in spec.split(','):
+        start, _, end = part.strip().partition('-')
+        if start:
+            ports.update(range(int(start), int(end or start) + 1))
+    return ports
+
+# Listening ports shown as services; override with e.g. DASHBOARD_PORTS=8000-8999,5000
+SERVICE_PORTS = parse_ports(os.environ.get('DASHBOARD_PORTS', '8000-8999'))
 
 _stop = False
 
@@ -33,64 +58,436 @@ def _sigint(*_):
 
 signal.signal(signal.SIGINT, _sigint)
 
-async def check_port_open(host: str, port: int, timeout: float = 0.5) -> bool:
-    """Check if a port is open and accepting connections."""
+def list_listening_ports(paths=('/proc/net/tcp', '/proc/net/tcp6')) -> Dict[int, int]:
+    """Map listening TCP ports to their socket inode, read from /proc/net without connecting."""
+    ports = {}
+    for path in paths:
+        try:
+            with open(path) as f:
+                next(f)  # header
+                for line in f:
+                    fields = line.split()
+                    if fields[3] != '0A':  # TCP_LISTEN
+                        continue
+                    port = int(fields[1].rsplit(':', 1)[1], 16)
+                    ports.setdefault(port, int(fields[9]))
+        except OSError:
+            continue
+    return ports
+
+def list_writer_sockets(path: str = '/proc/net/unix') -> Set[int]:
+    """Inodes of listening abstract `.bbos` sockets, i.e. bbos writers."""
+    inodes = set()
     try:
-        reader, writer = await asyncio.wait_for(
-            asyncio.open_connection(host, port),
-            timeout=timeout
-        )
-        writer.close()
-        await writer.wait_closed()
-        return True
-    except (asyncio.TimeoutError, ConnectionRefusedError, OSError):
-        return False
-
-async def get_page_title(port: int, timeout: float = 2.0) -> str:
+        with open(path) as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 8 and fields[5] == '01' and fields[7].startswith('@') and fields[7].endswith('.bbos'):
+                    inodes.add(int(fields[6]))
+    except OSError:
+        pass
+    return inodes
+
+def socket_inodes(pid: int) -> Set[int]:
+    """Inodes of the sockets a process has open."""
+    inodes = set()
+    try:
+        fds = os.listdir(f"/proc/{pid}/fd")
+    except OSError:
+        return inodes
+    for fd in fds:
+        try:
+            link = os.readlink(f"/proc/{pid}/fd/{fd}")
+        except OSError:
+            continue
+        if link.startswith('socket:['):
+            inodes.add(int(link[8:-1]))
+    return inodes
+
+async def get_page_title(client: httpx.AsyncClient, port: int) -> Optional[str]:
     """Attempt to get the page title from a service running on the given port."""
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(f"http://localhost:{port}/")
-            if response.status_code == 200:
-                # Try to extract title from HTML
-                content = response.text
-                title_match = re.search(r'<title[^>]*>([^<]+)</title>', content, re.IGNORECASE)
-                if title_match:
-                    return title_match.group(1).strip()
-                # If no title, return a generic name
-                return f"Service on port {port}"
+        response = await client.get(f"http://localhost:{port}/")
+        if response.status_code == 200:
+            # Try to extract title from HTML
+            content = response.text
+            title_match = re.search(r'<title[^>]*>([^<]+)</title>', content, re.IGNORECASE)
+            if title_match:
+                return title_match.group(1).strip()
+            # If no title, return a generic name
+            return f"Service on port {port}"
     except Exception:
         pass
-    return f"Port {port}"
+    return None
+
+class ServiceScanner:
+    """Listening services in SERVICE_PORTS with their page titles.
+
+    Listeners come from /proc/net/tcp{,6}. Titles are cached per
+    (port, socket inode) and only fetched again when a different socket
+    listens on the port (or TITLE_RETRY after a failed fetch), all through
+    one pooled HTTP client.
+    """
+
+    def __init__(self, ports: Set[int] = SERVICE_PORTS, timeout: float = 2.0):
+        self.ports = ports
+        self.timeout = timeout
+        self.titles: Dict[tuple, tuple] = {}  # (port, inode) -> (title, retry_at or None)
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def scan(self) -> Dict[int, str]:
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=self.timeout)
+        listeners = {port: inode for port, inode in list_listening_ports().items() if port in self.ports}
+        keys = set(listeners.items())
+        # Forget listeners that went away
+        self.titles = {key: entry for key, entry in self.titles.items() if key in keys}
+        now = time.monotonic()
+        due = [key for key in keys
+               if key not in self.titles or (self.titles[key][1] is not None and self.titles[key][1] <= now)]
+        if due:
+            titles = await asyncio.gather(*(get_page_title(self.client, port) for port, _ in due))
+            for (port, inode), title in zip(due, titles):
+                if title is None:
+                    self.titles[(port, inode)] = (f"Port {port}", now + TITLE_RETRY)
+                else:
+                    self.titles[(port, inode)] = (title, None)
+        return {port: self.titles[(port, inode)][0] for port, inode in sorted(listeners.items())}
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+scanner = ServiceScanner()
+
+def runs_app(name: str, cmdline: List[str]) -> bool:
+    """Whether a command line runs app `name` (`name.py` or `name/main.py`)."""
+    for arg in cmdline:
+        parts = arg.split('/')
+        if parts[-1] == f"{name}.py" or parts[-2:] == [name, "main.py"]:
+            return True
+    return False
+
+def find_app_roots(names: List[str]) -> Dict[str, List[psutil.Process]]:
+    """Top-most processes running each app, from one pass over all processes."""
+    found = {name: [] for name in names}
+    for proc in psutil.process_iter(['ppid', 'cmdline']):
+        cmdline = proc.info['cmdline'] or []
+        for name in names:
+            if runs_app(name, cmdline):
+                found[name].append(proc)
+    # Drop processes whose parent runs the same app (e.g. python under `uv run`)
+    for name, procs in found.items():
+        pids = {proc.pid for proc in procs}
+        found[name] = [proc for proc in procs if proc.info['ppid'] not in pids]
+    return found
+
+def thread_ctx_switches(proc: psutil.Process) -> int:
+    """Context switches of all of a process's threads.
+
+    /proc/<pid>/status (what psutil reads) only counts the main thread, while
+    the apps do their work in reader and server threads.
+    """
+    total = 0
+    try:
+        tids = os.listdir(f"/proc/{proc.pid}/task")
+    except OSError:
+        switches = proc.num_ctx_switches()
+        return switches.voluntary + switches.involuntary
+    for tid in tids:
+        try:
+            with open(f"/proc/{proc.pid}/task/{tid}/status") as f:
+                for line in f:
+                    if "ctxt_switches" in line:
+                        total += int(line.split()[1])
+        except (OSError, ValueError):
+            continue  # thread exited
+    return total
+
+class AppTree:
+    """Cached psutil handles for one app's process tree and its sample history.
+
+    Handles are kept across samples so cpu_percent measures the time since
+    the last sample; the tree under the root processes is re-listed every
+    RESOURCE_RESCAN seconds or when one of its processes exits.
+    """
+
+    def __init__(self, roots: List[psutil.Process]):
+        self.roots = roots
+        self.procs: Dict[int, psutil.Process] = {}
+        self.listed_at = float('-inf')
+        self.history = deque(maxlen=RESOURCE_HISTORY)
+        self.last_ctx = None  # (monotonic time, total context switches)
+
+    def alive(self) -> bool:
+        return any(root.is_running() for root in self.roots)
+
+    def relist(self, now: float) -> None:
+        procs = {}
+        for root in self.roots:
+            try:
+                members = [root, *root.children(recursive=True)]
+            except psutil.NoSuchProcess:
+                continue
+            for proc in members:
+                cached = self.procs.get(proc.pid)
+                # psutil compares pid and create time, so a reused pid gets a new handle
+                procs[proc.pid] = cached if cached == proc else proc
+        self.procs = procs
+        self.listed_at = now
+
+    def sample(self, now: float) -> dict:
+        if now - self.listed_at >= RESOURCE_RESCAN:
+            self.relist(now)
+        cpu = 0.0
+        rss = threads = ctx = 0
+        for pid, proc in list(self.procs.items()):
+            try:
+                with proc.oneshot():
+                    cpu += proc.cpu_percent(None)
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+                ctx += thread_ctx_switches(proc)
+            except psutil.NoSuchProcess:
+                del self.procs[pid]
+                self.listed_at = float('-inf')
+            except psutil.AccessDenied:
+                continue
+        rate = 0.0
+        if self.last_ctx is not None and now > self.last_ctx[0]:
+            # Exited processes take their counts with them, so never report a negative rate
+            rate = max(0.0, (ctx - self.last_ctx[1]) / (now - self.last_ctx[0]))
+        self.last_ctx = (now, ctx)
+        return {"t": time.time(), "cpu": round(cpu, 1), "rss": rss, "threads": threads, "ctx": round(rate)}
+
+class AppMonitor:
+    """CPU, memory, threads and context switches of every running app.
+
+    One task samples all apps every RESOURCE_INTERVAL in an executor and
+    broadcasts the new samples; tabs get the history in their snapshot. A
+    full process scan only happens for apps whose processes aren't known yet
+    (at most every RESOURCE_RESCAN per app). The executor only reads psutil
+    into a new app dict; `apps` and the histories change on the event loop.
+    """
+
+    def __init__(self, interval: float = RESOURCE_INTERVAL):
+        self.interval = interval
+        self.apps: Dict[str, AppTree] = {}
+        self.searched: Dict[str, float] = {}  # app -> when its processes were last searched for
+
+    def sample(self, running: List[str], apps: Dict[str, AppTree], searched: Dict[str, float]):
+        """Sample `apps` (a copy) in the executor; return the new apps and their samples."""
+        now = time.monotonic()
+        apps = {name: tree for name, tree in apps.items() if name in running}
+        lost = [name for name in running
+                if (name not in apps or not apps[name].alive())
+                and now - searched.get(name, float('-inf')) >= RESOURCE_RESCAN]
+        if lost:
+            for name, roots in find_app_roots(lost).items():
+                searched[name] = now
+                if roots:
+                    apps[name] = AppTree(roots)
+                else:
+                    apps.pop(name, None)
+        return apps, {name: tree.sample(now) for name, tree in apps.items()}
+
+    def histories(self) -> Dict[str, list]:
+        return {name: list(tree.history) for name, tree in self.apps.items()}
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not _stop:
+            running = [name for name, is_running in poller.apps.items() if is_running]
+            try:
+                searched = dict(self.searched)
+                apps, samples = await loop.run_in_executor(None, self.sample, running, dict(self.apps), searched)
+                self.apps, self.searched = apps, searched
+                for name, sample in samples.items():
+                    apps[name].history.append(sample)
+                if samples:
+                    await poller.broadcast(json.dumps({"resources": samples}))
+            except Exception as e:
+                print(f"[dashboard] Resource sampling failed: {e}")
+            await asyncio.sleep(self.interval)
+
+monitor = AppMonitor()
+
+def app_ready(roots: List[psutil.Process]) -> bool:
+    """Whether an app's processes listen on a TCP port or serve a bbos writer."""
+    listening = set(list_listening_ports().values()) | list_writer_sockets()
+    for root in roots:
+        try:
+            procs = [root, *root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            continue
+        if any(socket_inodes(proc.pid) & listening for proc in procs):
+            return True
+    return False
+
+class StartupTracker:
+    """Cold-start latency of each app: from the start request until it's useful.
+
+    An app is ready once one of its processes listens on a TCP port or serves
+    a bbos writer. Watching starts when the poller sees an app go from
+    stopped to running, so starts from elsewhere (e.g. hey_bracketbot.py)
+    are measured too. Those count from the app's process creation but are
+    only noticed at the next status refresh, so a fast one can read up to
+    REFRESH_TIME slow; starts from the dashboard count from the request.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, dict] = {}
+        self.requested: Dict[str, float] = {}  # app -> when the dashboard asked to start it
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def entry(self, name: str) -> dict:
+        return self.stats.setdefault(name, {
+            "count": 0, "sum": 0.0, "last": None, "timeouts": 0, "starting": None,
+            "buckets": [0] * (len(STARTUP_BUCKETS) + 1),  # the last bucket counts slower starts
+        })
+
+    def request(self, name: str) -> None:
+        self.requested[name] = time.time()
+
+    def record(self, name: str, latency: float) -> None:
+        entry = self.entry(name)
+        entry["count"] += 1
+        entry["sum"] += latency
+        entry["last"] = latency
+        entry["buckets"][sum(latency > bound for bound in STARTUP_BUCKETS)] += 1
+
+    def observe(self, old: Dict[str, bool], new: Dict[str, bool]) -> None:
+        """Start watching apps that went from stopped to running."""
+        for name, running in new.items():
+            if running and old.get(name) is False and name not in self.tasks:
+                self.tasks[name] = asyncio.create_task(self.watch(name))
+
+    async def watch(self, name: str) -> None:
+        loop = asyncio.get_running_loop()
+        requested = self.requested.pop(name, None)
+        started = requested if requested and time.time() - requested < READY_TIMEOUT else time.time()
+        entry = self.entry(name)
+        entry["starting"] = started
+        await poller.broadcast(json.dumps({"startup": {name: entry}}))
+        deadline = time.monotonic() + READY_TIMEOUT
+        roots = []
+        ready = False
+        try:
+            while not _stop and poller.apps.get(name) and time.monotonic() < deadline:
+                if not any(root.is_running() for root in roots):
+                    roots = (await loop.run_in_executor(None, find_app_roots, [name]))[name]
+                    if roots and requested is None:
+                        started = min(started, min(root.create_time() for root in roots))
+                if roots and await loop.run_in_executor(None, app_ready, roots):
+                    ready = True
+                    break
+                await asyncio.sleep(READY_POLL)
+            if ready:
+                self.record(name, time.time() - started)
+            elif time.monotonic() >= deadline:
+                entry["timeouts"] += 1
+        except Exception as e:
+            print(f"[dashboard] Watching {name} start failed: {e}")
+        finally:
+            entry["starting"] = None
+            del self.tasks[name]
+        await poller.broadcast(json.dumps({"startup": {name: entry}}))
+
+startup = StartupTracker()
+
+def diff_entries(old: dict, new: dict) -> tuple:
+    """Entries of `new` that are added or changed from `old`, and keys removed."""
+    changed = {k: v for k, v in new.items() if old.get(k, object()) != v}
+    removed = [k for k in old if k not in new]
+    return changed, removed
+
+class StatusPoller:
+    """App and service state refreshed once for every connected tab.
+
+    Each refresh runs the blocking get_status in an executor and scans the
+    ports, then sends connected sockets only the apps and services that
+    changed. A new socket gets the full state once.
+    """
+
+    def __init__(self, interval: float = REFRESH_TIME):
+        self.interval = interval
+        self.apps: Dict[str, bool] = {}
+        self.services: Dict[int, str] = {}
+        self.clients: Dict[WebSocket, asyncio.Lock] = {}  # socket -> lock serializing its sends
+        self.wake = asyncio.Event()
+
+    def snapshot(self) -> str:
+        return json.dumps({"full": True, "apps": self.apps, "services": self.services,
+                           "history": monitor.histories(), "startup": startup.stats,
+                           "startup_buckets": STARTUP_BUCKETS})
+
+    async def refresh(self) -> None:
+        loop = asyncio.get_running_loop()
+        apps = await loop.run_in_executor(None, lambda: get_status(exclude=['dashboard']))
+        services = await scanner.scan()
+        apps_changed, apps_removed = diff_entries(self.apps, apps)
+        services_changed, services_removed = diff_entries(self.services, services)
+        startup.observe(self.apps, apps)
+        self.apps, self.services = apps, services
+        if apps_changed or apps_removed or services_changed or services_removed:
+            await self.broadcast(json.dumps({
+                "apps": apps_changed,
+                "services": services_changed,
+                "removed_apps": apps_removed,
+                "removed_services": services_removed,
+            }))
 
-async def scan_ports() -> dict:
-    """Scan for active services in the port range."""
-    active_services = {}
-    
-    # Check each port in parallel
-    tasks = []
-    for port in PORT_SCAN_RANGE:
-        tasks.append(check_port_open('localhost', port))
-    
-    results = await asyncio.gather(*tasks)
-    
-    # For open ports, get their titles
-    title_tasks = []
-    open_ports = []
-    for port, is_open in zip(PORT_SCAN_RANGE, results):
-        if is_open:
-            open_ports.append(port)
-            title_tasks.append(get_page_title(port))
-    
-    if title_tasks:
-        titles = await asyncio.gather(*title_tasks)
-        for port, title in zip(open_ports, titles):
-            active_services[port] = title
-    
-    return active_services
+    async def run(self) -> None:
+        while not _stop:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"[dashboard] Status refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+
+    def poke(self) -> None:
+        """Refresh now instead of at the next interval (e.g. after starting an app)."""
+        self.wake.set()
+
+    async def add(self, websocket: WebSocket) -> None:
+        self.clients[websocket] = asyncio.Lock()
+        await self.send(websocket, self.snapshot())
+
+    def remove(self, websocket: WebSocket) -> None:
+        self.clients.pop(websocket, None)
+
+    async def send(self, websocket: WebSocket, message: str) -> None:
+        lock = self.clients.get(websocket)
+        if lock is None:
+            return
+        try:
+            async with lock:
+                await websocket.send_text(message)
+        except Exception:
+            # Its receive loop will see the disconnect; stop sending to it now
+            self.remove(websocket)
+
+    async def broadcast(self, message: str) -> None:
+        await asyncio.gather(*(self.send(ws, message) for ws in list(self.clients)))
+
+poller = StatusPoller()
 
 def main():
-    app = FastAPI()
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        tasks = [asyncio.create_task(poller.run()), asyncio.create_task(monitor.run())]
+        yield
+        for task in tasks:
+            task.cancel()
+        await scanner.close()
+    
+    app = FastAPI(lifespan=lifespan)
     
     @app.get("/", response_class=HTMLResponse)
     async def root():
@@ -167,6 +564,68 @@ h1, h2 {
   color: white;
 }
 
+.app-resources {
+  margin-top: 8px;
+  font-size: 12px;
+  color: #aaa;
+}
+
+.resource-row {
+  display: flex;
+  align-items: center;
+  justify-content: space-between;
+  gap: 10px;
+  margin: 3px 0;
+}
+
+.resource-value {
+  color: #ddd;
+  white-space: nowrap;
+}
+
+.sparkline {
+  width: 120px;
+  height: 20px;
+  flex-shrink: 0;
+}
+
+.app-startup {
+  margin-top: 8px;
+  font-size: 12px;
+  color: #aaa;
+}
+
+.startup-histogram {
+  display: flex;
+  align-items: flex-end;
+  gap: 2px;
+  height: 24px;
+  margin-top: 4px;
+}
+
+.startup-bar {
+  flex: 1;
+  background: #9C27B0;
+  min-height: 1px;
+}
+
+.app-header {
+  display: flex;
+  justify-content: space-between;
+  align-items: center;
+}
+
+.batch-bar {
+  display: flex;
+  gap: 10px;
+  align-items: center;
+}
+
+.batch-bar .toggle-btn {
+  width: auto;
+  margin-top: 0;
+}
+
 .toggle-btn {
   background: #2196F3;
   color: white;
@@ -238,31 +697,66 @@ h1, h2 {
   </div>
   
   <div class="section">
-    <h2>Applications</h2>
+    <div class="app-header">
+      <h2>Applications</h2>
+      <div class="batch-bar">
+        <button class="toggle-btn" id="batch-start" onclick="batchApps('start')" disabled>Start selected</button>
+        <button class="toggle-btn" id="batch-stop" onclick="batchApps('stop')" disabled>Stop selected</button>
+      </div>
+    </div>
     <div id="apps-container" class="loading">Loading apps...</div>
   </div>
 </div>
 
 <script>
 let ws = null;
+const state = { apps: {}, services: {}, resources: {}, startup: {}, startupBuckets: [] };
+const selected = new Set();
+const RESOURCE_HISTORY = 60;  // samples per app, as kept by the server
 
 function connectWebSocket() {
   const protocol = location.protocol === "https:" ? "wss://" : "ws://";
   ws = new WebSocket(protocol + location.host + "/ws");
   
   ws.onopen = function() {
+    // No get_status needed: the server sends the full snapshot on connect
     console.log("WebSocket connected");
-    requestStatus();
   };
   
   ws.onmessage = function(event) {
+    // The server sends the full state on connect, then only changed and removed entries
     const data = JSON.parse(event.data);
-    if (data.apps) {
-      updateApps(data.apps);
+    if (data.resources) {
+      // One new sample per running app, every couple of seconds
+      for (const [name, sample] of Object.entries(data.resources)) {
+        const samples = state.resources[name] = state.resources[name] || [];
+        samples.push(sample);
+        if (samples.length > RESOURCE_HISTORY) samples.shift();
+        renderResources(name);
+      }
+      return;
+    }
+    if (data.startup && !data.full) {
+      Object.assign(state.startup, data.startup);
+      Object.keys(data.startup).forEach(renderStartup);
+      return;
     }
-    if (data.services) {
-      updateServices(data.services);
+    if (data.full) {
+      state.apps = {};
+      state.services = {};
+      state.resources = data.history || {};
+      state.startup = data.startup || {};
+      state.startupBuckets = data.startup_buckets || [];
     }
+    Object.assign(state.apps, data.apps);
+    Object.assign(state.services, data.services);
+    (data.removed_apps || []).forEach(name => delete state.apps[name]);
+    (data.removed_services || []).forEach(port => delete state.services[port]);
+    for (const [name, isRunning] of Object.entries(state.apps)) {
+      if (!isRunning) delete state.resources[name];  // a restart starts a fresh history
+    }
+    updateApps(state.apps);
+    updateServices(state.services);
   };
   
   ws.onclose = function() {
@@ -275,12 +769,6 @@ function connectWebSocket() {
   };
 }
 
-function requestStatus() {
-  if (ws && ws.readyState === WebSocket.OPEN) {
-    ws.send(JSON.stringify({ action: "get_status" }));
-  }
-}
-
 function toggleApp(appName, isRunning) {
   if (ws && ws.readyState === WebSocket.OPEN) {
     const action = isRunning ? "stop_app" : "start_app";
@@ -288,6 +776,19 @@ function toggleApp(appName, isRunning) {
   }
 }
 
+function toggleSelected(appName, checked) {
+  if (checked) selected.add(appName); else selected.delete(appName);
+  document.getElementById("batch-start").disabled = selected.size === 0;
+  document.getElementById("batch-stop").disabled = selected.size === 0;
+}
+
+function batchApps(op) {
+  // One message for all selected apps; the server runs them concurrently
+  if (ws && ws.readyState === WebSocket.OPEN && selected.size) {
+    ws.send(JSON.stringify({ action: "batch", [op]: [...selected] }));
+  }
+}
+
 function updateServices(services) {
   const container = document.getElementById("services-container");
   container.innerHTML = "";
@@ -313,6 +814,74 @@ function updateServices(services) {
   }
 }
 
+function formatBytes(bytes) {
+  if (bytes >= 1 << 30) return (bytes / (1 << 30)).toFixed(1) + " GB";
+  return (bytes / (1 << 20)).toFixed(0) + " MB";
+}
+
+function sparkline(values, color) {
+  if (values.length < 2) return `<svg class="sparkline"></svg>`;
+  const max = Math.max(...values) || 1;
+  const points = values.map((v, i) =>
+    `${(i / (RESOURCE_HISTORY - 1) * 100).toFixed(1)},${(20 - v / max * 18 - 1).toFixed(1)}`
+  ).join(" ");
+  return `<svg class="sparkline" viewBox="0 0 100 20" preserveAspectRatio="none">
+    <polyline points="${points}" fill="none" stroke="${color}" stroke-width="1.5" vector-effect="non-scaling-stroke"/>
+  </svg>`;
+}
+
+function renderResources(appName) {
+  const el = document.getElementById(`resources-${appName}`);
+  const samples = state.resources[appName] || [];
+  if (!el || !state.apps[appName] || samples.length === 0) {
+    if (el) el.innerHTML = "";
+    return;
+  }
+  const last = samples[samples.length - 1];
+  const rows = [
+    ["CPU", `${last.cpu.toFixed(1)}%`, samples.map(s => s.cpu), "#4CAF50"],
+    ["Memory", formatBytes(last.rss), samples.map(s => s.rss), "#2196F3"],
+    ["Threads", `${last.threads}`, samples.map(s => s.threads), "#FFC107"],
+    ["Switches", `${last.ctx}/s`, samples.map(s => s.ctx), "#E91E63"],
+  ];
+  el.innerHTML = rows.map(([label, value, values, color]) => `
+    <div class="resource-row">
+      <span>${label} <span class="resource-value">${value}</span></span>
+      ${sparkline(values, color)}
+    </div>
+  `).join("");
+}
+
+function formatSeconds(s) {
+  return s < 10 ? `${s.toFixed(2)} s` : `${s.toFixed(1)} s`;
+}
+
+function renderStartup(appName) {
+  const el = document.getElementById(`startup-${appName}`);
+  const entry = state.startup[appName];
+  if (!el || !entry) return;
+  if (entry.starting) {
+    el.innerHTML = `Starting… (since ${new Date(entry.starting * 1000).toLocaleTimeString()})`;
+    return;
+  }
+  if (entry.count === 0) {
+    el.innerHTML = entry.timeouts ? `Cold start: ${entry.timeouts} timed out` : "";
+    return;
+  }
+  const bounds = state.startupBuckets;
+  const max = Math.max(...entry.buckets);
+  const bars = entry.buckets.map((n, i) => {
+    const label = i < bounds.length ? `≤ ${bounds[i]} s` : `> ${bounds[bounds.length - 1]} s`;
+    return `<div class="startup-bar" style="height: ${n / max * 100}%" title="${label}: ${n}"></div>`;
+  }).join("");
+  el.innerHTML = `
+    Cold start <span class="resource-value">${formatSeconds(entry.last)}</span>
+    · mean ${formatSeconds(entry.sum / entry.count)} · n=${entry.count}
+    ${entry.timeouts ? ` · ${entry.timeouts} timed out` : ""}
+    <div class="startup-histogram">${bars}</div>
+  `;
+}
+
 function updateApps(apps) {
   const container = document.getElementById("apps-container");
   container.innerHTML = "";
@@ -328,22 +897,28 @@ function updateApps(apps) {
     card.className = `app-card ${isRunning ? "running" : "stopped"}`;
     
     card.innerHTML = `
-      <div class="app-name">${appName}</div>
+      <div class="app-name">
+        <input type="checkbox" ${selected.has(appName) ? "checked" : ""} onchange="toggleSelected('${appName}', this.checked)">
+        ${appName}
+      </div>
       <div class="app-status ${isRunning ? "status-running" : "status-stopped"}">
         ${isRunning ? "RUNNING" : "STOPPED"}
       </div>
+      <div class="app-resources" id="resources-${appName}"></div>
+      <div class="app-startup" id="startup-${appName}"></div>
       <button class="toggle-btn" onclick="toggleApp('${appName}', ${isRunning})">
         ${isRunning ? "Stop" : "Start"} App
       </button>
     `;
     
     container.appendChild(card);
+    renderResources(appName);
+    renderStartup(appName);
   }
 }
 
-// Connect WebSocket and refresh status periodically
+// Status updates are pushed by the server as they happen
 connectWebSocket();
-setInterval(requestStatus, """ + str(int(REFRESH_TIME * 1000)) + """);
 </script>
 """)
     
@@ -351,49 +926,51 @@ setInterval(requestStatus, """ + str(int(REFRESH_TIME * 1000)) + """);
     async def websocket_endpoint(websocket: WebSocket):
         await websocket.accept()
         print("[dashboard] WebSocket client connected")
-        status = lambda: get_status(exclude=['dashboard'])
-        
-        async def send_full_status():
-            apps = status()
-            services = await scan_ports()
-            await websocket.send_text(json.dumps({
-                "apps": apps,
-                "services": services
-            }))
+        loop = asyncio.get_running_loop()
         
         try:
+            await poller.add(websocket)
             while not _stop:
-                try:
-                    # Wait for message with timeout
-                    message = await asyncio.wait_for(websocket.receive_text(), timeout=1.0)
-                    data = json.loads(message)
-                    
-                    if data.get("action") == "get_status":
-                        await send_full_status()
-                    
-                    elif data.get("action") == "start_app":
-                        app_name = data.get("app_name")
-                        if app_name:
-                            success = start_app(app_name)
-                            if success:
-                                await send_full_status()
-                    
-                    elif data.get("action") == "stop_app":
-                        app_name = data.get("app_name")
-                        if app_name:
-                            success = stop_app(app_name)
-                            print(f"[dashboard] Stopping app: {app_name} - {success}")
-                            if success:
-                                await send_full_status()
+                message = await websocket.receive_text()
+                data = json.loads(message)
+                
+                if data.get("action") == "get_status":
+                    await poller.send(websocket, poller.snapshot())
+                
+                elif data.get("action") == "start_app":
+                    app_name = data.get("app_name")
+                    if app_name:
+                        startup.request(app_name)
+                        success = await loop.run_in_executor(None, start_app, app_name)
+                        if success:
+                            poller.poke()
                 
-                except asyncio.TimeoutError:
-                    # Send periodic status updates
-                    await send_full_status()
+                elif data.get("action") == "stop_app":
+                    app_name = data.get("app_name")
+                    if app_name:
+                        success = await loop.run_in_executor(None, stop_app, app_name)
+                        print(f"[dashboard] Stopping app: {app_name} - {success}")
+                        if success:
+                            poller.poke()
+
+                elif data.get("action") == "batch":
+                    # Start and stop several apps concurrently in one round trip
+                    jobs = [(start_app, name) for name in data.get("start", [])]
+                    jobs += [(stop_app, name) for name in data.get("stop", [])]
+                    for name in data.get("start", []):
+                        startup.request(name)
+                    results = await asyncio.gather(*(loop.run_in_executor(None, fn, name) for fn, name in jobs))
+                    print("[dashboard] Batch: " + ", ".join(
+                        f"{fn.__name__} {name} - {ok}" for (fn, name), ok in zip(jobs, results)))
+                    if any(results):
+                        poller.poke()
                     
         except WebSocketDisconnect:
             print("[dashboard] WebSocket client disconnected")
         except Exception as e:
             print(f"[dashboard] WebSocket error: {e}")
+        finally:
+            poller.remove(websocket)
 
     # Run the server
     uvicorn.run(
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = [
+#   "numpy",
+#   "fastapi",
+#   "uvicorn",
+#   "websockets",
+#   "psutil",
+#   "orjson",
+# ]
+# ///
+"""Micro-benchmark: per-message JSON conversion vs. precompiled JsonEncoder."""
+
+import json
+import time
+import numpy as np
+
+from main import JsonEncoder, convert_numpy_to_json
+from sim import DTYPES, make_record
+
+ITERATIONS = 2000
+
+def legacy_encode(writer: str, data, skip_jpeg: bool = False) -> str:
+    """What /ws/writer used to do per message (convert + send_json)."""
+    json_data = convert_numpy_to_json(data, skip_jpeg=skip_jpeg)
+    return json.dumps({
+        'writer': writer,
+        'data': json_data,
+        'timestamp': str(json_data.get('timestamp'))
+    })
+
+def same_message(a: str, b: str) -> bool:
+    """Compare two messages, allowing float32 fields to round differently."""
+    a, b = json.loads(a), json.loads(b)
+    if a.keys() != b.keys() or a['data'].keys() != b['data'].keys():
+        return False
+    for name, value in a['data'].items():
+        if isinstance(value, list):
+            if not np.allclose(value, b['data'][name], rtol=1e-6):
+                return False
+        elif value != b['data'][name]:
+            return False
+    return a['timestamp'] == b['timestamp']
+
+def bench(fn, records) -> float:
+    """Mean microseconds per call over `records`."""
+    start = time.perf_counter()
+    for record in records:
+        fn(record)
+    return (time.perf_counter() - start) / len(records) * 1e6
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'writer':<20}{'legacy us':>12}{'compiled us':>14}{'speedup':>10}")
+    for writer in DTYPES:
+        records = [make_record(writer, rng) for _ in range(ITERATIONS)]
+        # /ws/writer leaves camera frames to the MJPEG stream
+        skip_jpeg = (writer == 'camera.jpeg')
+        encoder = JsonEncoder(writer, records[0].dtype, skip_jpeg=skip_jpeg)
+        # Both paths must produce the same message
+        assert same_message(encoder.encode(records[0]), legacy_encode(writer, records[0], skip_jpeg))
+        legacy = bench(lambda r: legacy_encode(writer, r, skip_jpeg), records)
+        compiled = bench(encoder.encode, records)
+        print(f"{writer:<20}{legacy:>12.1f}{compiled:>14.1f}{legacy / compiled:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
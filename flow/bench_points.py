@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = [
+#   "numpy",
+#   "fastapi",
+#   "uvicorn",
+#   "websockets",
+#   "psutil",
+#   "orjson",
+#   "opencv-python",
+#   "zstandard",
+# ]
+# ///
+"""Benchmark point cloud codecs: bytes per frame and encode time.
+
+Uses synthetic depth clouds by default; pass an .npz with `points` (N, 3)
+and optionally `colors` (N, 3) arrays to use a recorded cloud instead.
+"""
+
+import sys
+import time
+import numpy as np
+
+from main import encode_points
+from sim import depth_cloud
+
+FRAMES = 20
+
+VARIANTS = [
+    ('float16', 'none', 0),
+    ('int16', 'none', 0),
+    ('float16', 'zlib', 1),
+    ('int16', 'zlib', 1),
+    ('int16', 'zlib', 6),
+    ('int16', 'zstd', 1),
+    ('int16', 'zstd', 3),
+    ('int16', 'zstd', 9),
+]
+
+def load_frames():
+    if len(sys.argv) > 1:
+        recorded = np.load(sys.argv[1])
+        colors = recorded['colors'] if 'colors' in recorded else None
+        return [(recorded['points'].astype(np.float16), colors)]
+    rng = np.random.default_rng(0)
+    return [depth_cloud(rng) for _ in range(FRAMES)]
+
+def main() -> None:
+    frames = load_frames()
+    num_points = len(frames[0][0])
+    legacy = 4 + num_points * 9
+    print(f"{num_points} points/frame, legacy frame {legacy / 1024:.1f} KB")
+    print(f"{'codec':<10}{'compression':<14}{'KB/frame':>10}{'ratio':>8}{'encode ms':>11}")
+    for codec, compression, level in VARIANTS:
+        sizes = []
+        start = time.perf_counter()
+        for points, colors in frames:
+            sizes.append(len(encode_points(points, colors, codec, compression, level)))
+        elapsed = (time.perf_counter() - start) / len(frames) * 1e3
+        label = f"{compression}-{level}" if compression != 'none' else 'none'
+        size = np.mean(sizes)
+        print(f"{codec:<10}{label:<14}{size / 1024:>10.1f}{legacy / size:>7.1f}x{elapsed:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = [
+#   "numpy",
+#   "fastapi",
+#   "uvicorn",
+#   "websockets",
+#   "psutil",
+#   "orjson",
+#   "opencv-python",
+#   "zstandard",
+# ]
+# ///
+"""Benchmark: read latency with the reader in the web process vs. a split reader process.
+
+Each run starts flow on SimReader data, loads it with JSON WebSocket
+clients, and measures drive.state records both as they are read (record
+age in /api/stats) and as a binary probe client receives them.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import time
+import urllib.request
+import numpy as np
+import psutil
+import websockets
+
+from main import BINARY_HEADER, run
+from sim import SimReader
+
+PORT = 8090
+DURATION = 5.0  # seconds measured per run
+LOAD_CLIENTS = (0, 4, 16)
+LOAD_TOPICS = ('speakerphone.mic', 'camera.points')  # JSON encoding of these is what loads the web thread
+PROBE_TOPIC = 'drive.state'
+
+def serve(split: bool) -> None:
+    run(PORT, split, SimReader)
+
+def wait_until_up(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{PORT}/api/readers")
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+async def load_client(topic: str, stop: asyncio.Event) -> None:
+    async with websockets.connect(f"ws://localhost:{PORT}/ws/writer/{topic}", max_size=None) as ws:
+        while not stop.is_set():
+            await ws.recv()
+
+async def probe(stop: asyncio.Event) -> list:
+    """Receive latency (now - record timestamp) of every probe record, in ms."""
+    latencies = []
+    async with websockets.connect(f"ws://localhost:{PORT}/ws/writer/{PROBE_TOPIC}?format=binary") as ws:
+        await ws.recv()  # schema
+        while not stop.is_set():
+            frame = await ws.recv()
+            _, timestamp = BINARY_HEADER.unpack_from(frame)
+            latencies.append((time.time() - timestamp) * 1e3)
+    return latencies
+
+async def measure(clients: int, server: psutil.Process) -> dict:
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(load_client(LOAD_TOPICS[i % len(LOAD_TOPICS)], stop)) for i in range(clients)]
+    probe_task = asyncio.create_task(probe(stop))
+    await asyncio.sleep(1.0)  # let readers open and clients settle
+    processes = [server, *server.children(recursive=True)]
+    for p in processes:
+        p.cpu_percent(None)
+    await asyncio.sleep(DURATION)
+    cpu = sum(p.cpu_percent(None) for p in processes)
+    stats = json.loads(urllib.request.urlopen(f"http://localhost:{PORT}/api/stats").read())[PROBE_TOPIC]
+    stop.set()
+    latencies = await probe_task
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        'cpu': cpu,
+        'read_p50': stats['age_ms']['p50'],
+        'read_p99': stats['age_ms']['p99'],
+        'recv_p50': np.percentile(latencies, 50),
+        'recv_p99': np.percentile(latencies, 99),
+        'received': len(latencies),
+    }
+
+def main() -> None:
+    print(f"{'mode':<8}{'clients':>8}{'cpu %':>8}{'read p50':>10}{'read p99':>10}"
+          f"{'recv p50':>10}{'recv p99':>10}{'probe n':>9}   (latencies in ms)")
+    for split in (False, True):
+        for clients in LOAD_CLIENTS:
+            process = multiprocessing.Process(target=serve, args=(split,))
+            process.start()
+            try:
+                wait_until_up()
+                r = asyncio.run(measure(clients, psutil.Process(process.pid)))
+            finally:
+                process.terminate()
+                process.join()
+            print(f"{'split' if split else 'thread':<8}{clients:>8}{r['cpu']:>8.0f}{r['read_p50']:>10.2f}"
+                  f"{r['read_p99']:>10.2f}{r['recv_p50']:>10.2f}{r['recv_p99']:>10.2f}{r['received']:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = [
+#   "numpy",
+#   "fastapi",
+#   "uvicorn",
+#   "websockets",
+#   "psutil",
+#   "orjson",
+#   "opencv-python",
+#   "zstandard",
+# ]
+# ///
+"""Load test flow offline: SimReader writers, simulated dashboard and MJPEG clients.
+
+Starts flow on synthetic camera JPEGs, mic audio, transcripts, drive state
+and point clouds, attaches N dashboard clients (one /ws session each,
+subscribed like frontend.html) and M MJPEG clients, and reports server
+CPU and memory plus delivered fps, drop rate and latency per stream.
+
+    ./loadtest.py --clients 4 --mjpeg 2 --rate camera.jpeg=15 --split
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import time
+import urllib.request
+import numpy as np
+import psutil
+import websockets
+
+from main import BINARY_HEADER, MUX_HEADER, run
+from sim import RATES, SimReader, jpeg_time
+
+# What a dashboard client subscribes to on /ws: (channel, request, latency measurable)
+DASHBOARD_STREAMS = [
+    (1, {'topic': 'camera.jpeg', 'kind': 'record', 'format': 'binary', 'fps': 10}, True),
+    (2, {'topic': 'drive.state', 'kind': 'record', 'format': 'binary', 'fps': 10}, True),
+    (3, {'topic': 'transcript', 'kind': 'record', 'format': 'binary', 'fps': 0}, True),
+    (4, {'topic': 'speakerphone.mic', 'kind': 'envelope', 'width': 540, 'window_ms': 1000, 'fps': 30}, False),
+    (5, {'topic': 'camera.points', 'kind': 'points', 'codec': 'int16', 'compression': 'zlib', 'level': 1, 'fps': 10}, False),
+]
+
+class StreamStats:
+    """Frames one client received on one stream during the measured window."""
+
+    def __init__(self, label: str, expected_fps: float):
+        self.label = label
+        self.expected_fps = expected_fps
+        self.frames = 0
+        self.latencies = []  # ms
+
+    def add(self, start: float, timestamp: float = None) -> None:
+        now = time.time()
+        if now < start:
+            return
+        self.frames += 1
+        if timestamp is not None:
+            self.latencies.append((now - timestamp) * 1e3)
+
+def expected_fps(rate: float, fps: float) -> float:
+    return min(rate, fps) if fps else rate
+
+async def dashboard_client(port: int, rates: dict, start: float, results: list) -> None:
+    """One frontend-like /ws session; binary frames are routed by channel."""
+    streams = {}
+    for channel, request, timed in DASHBOARD_STREAMS:
+        rate = rates.get(request['topic'], 0)
+        if rate:
+            label = f"ws {request['kind']} {request['topic']}"
+            streams[channel] = (StreamStats(label, expected_fps(rate, request['fps'])), request, timed)
+    results.extend(stats for stats, _, _ in streams.values())
+    async with websockets.connect(f"ws://localhost:{port}/ws", max_size=None) as ws:
+        for channel, (_, request, _) in streams.items():
+            await ws.send(json.dumps({'op': 'subscribe', 'id': channel, **request}))
+        while True:
+            message = await ws.recv()
+            if isinstance(message, str):
+                continue  # schemas, envelope config and dashboard state
+            channel, = MUX_HEADER.unpack_from(message)
+            stats, request, timed = streams[channel]
+            timestamp = None
+            if timed:
+                _, timestamp = BINARY_HEADER.unpack_from(message, MUX_HEADER.size)
+            stats.add(start, timestamp)
+
+class ChunkedBody:
+    """Decoded body of a chunked HTTP response (how StreamingResponse is sent)."""
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+        self.buffer = bytearray()
+
+    async def fill(self) -> None:
+        size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+        if not size:
+            raise EOFError("response ended")
+        self.buffer += (await self.reader.readexactly(size + 2))[:-2]
+
+    async def readuntil(self, separator: bytes) -> bytes:
+        while (i := self.buffer.find(separator)) < 0:
+            await self.fill()
+        return self.take(i + len(separator))
+
+    async def readexactly(self, n: int) -> bytes:
+        while len(self.buffer) < n:
+            await self.fill()
+        return self.take(n)
+
+    def take(self, n: int) -> bytes:
+        data = bytes(self.buffer[:n])
+        del self.buffer[:n]
+        return data
+
+async def mjpeg_client(port: int, fps: float, scale: float, rate: float, start: float, results: list) -> None:
+    """Read /mjpeg/camera part by part; stamped frames give the latency."""
+    stats = StreamStats(f"mjpeg fps={fps:g} scale={scale:g}", expected_fps(rate, fps))
+    results.append(stats)
+    reader, writer = await asyncio.open_connection('localhost', port)
+    writer.write(f"GET /mjpeg/camera?fps={fps}&scale={scale} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readuntil(b'\r\n\r\n')  # response headers
+    body = ChunkedBody(reader)
+    try:
+        while True:
+            await body.readuntil(b'Content-Length: ')
+            size = int((await body.readuntil(b'\r\n\r\n')).strip())
+            jpeg = await body.readexactly(size)
+            stats.add(start, jpeg_time(jpeg))
+    finally:
+        writer.close()
+
+async def load(args, rates: dict, server: psutil.Process) -> tuple:
+    start = time.time() + args.warmup
+    results = []
+    tasks = [asyncio.create_task(dashboard_client(args.port, rates, start, results)) for _ in range(args.clients)]
+    tasks += [
+        asyncio.create_task(mjpeg_client(args.port, args.mjpeg_fps, args.mjpeg_scale, rates.get('camera.jpeg', 0), start, results))
+        for _ in range(args.mjpeg)
+    ]
+    await asyncio.sleep(args.warmup)
+    processes = [server, *server.children(recursive=True)]
+    for p in processes:
+        p.cpu_percent(None)
+    await asyncio.sleep(args.duration)
+    cpu = sum(p.cpu_percent(None) for p in processes)
+    rss = sum(p.memory_info().rss for p in processes)
+    for task in tasks:
+        task.cancel()
+    errors = [r for r in await asyncio.gather(*tasks, return_exceptions=True)
+              if isinstance(r, Exception) and not isinstance(r, asyncio.CancelledError)]
+    return cpu, rss, results, errors
+
+def wait_until_up(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/api/readers")
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+def report(args, cpu: float, rss: int, results: list, errors: list) -> None:
+    mode = 'split reader process' if args.split else 'reader thread'
+    print(f"flow load test: {args.clients} dashboard + {args.mjpeg} MJPEG clients, "
+          f"{args.duration:g} s, {mode}")
+    print(f"server cpu {cpu:.0f}% (100% = one core), rss {rss / 2**20:.0f} MB")
+    if errors:
+        print(f"{len(errors)} client(s) failed: {errors[0]!r}")
+    print()
+    print(f"{'stream':<32}{'clients':>8}{'want fps':>9}{'fps avg':>9}{'fps min':>9}{'drop %':>8}"
+          f"{'p50 ms':>8}{'p90 ms':>8}{'p99 ms':>8}")
+    by_label = {}
+    for stats in results:
+        by_label.setdefault(stats.label, []).append(stats)
+    for label, group in by_label.items():
+        fps = np.array([s.frames / args.duration for s in group])
+        want = group[0].expected_fps
+        drop = max(0.0, 1 - fps.mean() / want) * 100 if want else 0.0
+        latencies = np.concatenate([s.latencies for s in group]) if any(s.latencies for s in group) else None
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if latencies is not None else ('-',) * 3
+        fmt = lambda v: f"{v:>8.1f}" if isinstance(v, float) else f"{v:>8}"
+        print(f"{label:<32}{len(group):>8}{want:>9.1f}{fps.mean():>9.1f}{fps.min():>9.1f}{drop:>8.1f}"
+              f"{fmt(p50)}{fmt(p90)}{fmt(p99)}")
+
+def parse_rate(text: str) -> tuple:
+    name, _, hz = text.partition('=')
+    return name, float(hz)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=4, help="dashboard (/ws) clients")
+    parser.add_argument('--mjpeg', type=int, default=2, help="/mjpeg/camera clients")
+    parser.add_argument('--mjpeg-fps', type=float, default=0, help="fps each MJPEG client asks for (0 = camera rate)")
+    parser.add_argument('--mjpeg-scale', type=float, default=1.0, help="scale each MJPEG client asks for")
+    parser.add_argument('--rate', type=parse_rate, action='append', default=[], metavar='WRITER=HZ',
+                        help=f"writer rate override, 0 disables (defaults: {', '.join(f'{k}={v:g}' for k, v in RATES.items())})")
+    parser.add_argument('--duration', type=float, default=10.0, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=2.0, help="seconds before measuring")
+    parser.add_argument('--split', action='store_true', help="run flow with a separate reader process")
+    parser.add_argument('--port', type=int, default=8091)
+    args = parser.parse_args()
+
+    rates = {**RATES, **dict(args.rate)}
+    server = multiprocessing.Process(target=run, args=(args.port, args.split, functools.partial(SimReader, rates=rates)))
+    server.start()
+    try:
+        wait_until_up(args.port)
+        cpu, rss, results, errors = asyncio.run(load(args, rates, psutil.Process(server.pid)))
+    finally:
+        server.terminate()
+        server.join()
+    report(args, cpu, rss, results, errors)
+
+if __name__ == "__main__":
+    main()
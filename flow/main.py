@@ -6,35 +6,63 @@
 #   "uvicorn",
 #   "websockets",
 #   "psutil",
+#   "orjson",
+#   "opencv-python",
+#   "zstandard",
 #   "bbos",
 # ]
 # [tool.uv.sources]
 # bbos = { path = "/home/bracketbot/BracketBotOS", editable = true }
 # ///
 
+import _thread
 import asyncio
+import functools
 import json
+import multiprocessing
 import os
-import subprocess
+import signal
 import socket
+import struct
+import sys
+import time
+import zlib
 import psutil
 import numpy as np
-from typing import Dict, Any, List
+import orjson
+import cv2
+import zstandard
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from bbos import Reader, Config
+try:
+    from bbos import Reader, Config
+except ImportError:
+    # Offline (loadtest.py and the bench_*.py scripts): records come from sim.SimReader
+    Reader = None
+    from sim import Config
 import threading
-import queue
 from datetime import datetime
-from contextlib import ExitStack
+from contextlib import asynccontextmanager
+from multiprocessing import resource_tracker, shared_memory
 
 # Configuration
 CFG_SPKPN = Config("speakerphone")
 AUDIO_BUFFER_MS = 5000  # 5 seconds of audio buffer
 
-# Readers based on actual writers
+# Audio writers that can be streamed as waveform envelopes or WAV, with their formats
+AUDIO_SAMPLE_RATES = {
+    'speakerphone.mic': CFG_SPKPN.mic_sample_rate,
+    'speakerphone.speaker': CFG_SPKPN.speaker_sample_rate,
+}
+AUDIO_CHANNELS = {
+    'speakerphone.mic': CFG_SPKPN.mic_channels,
+    'speakerphone.speaker': CFG_SPKPN.speaker_channels,
+}
+
+# Topics the dashboard subscribes to by default; any discovered writer can be read
 READERS = [
     'camera.jpeg',
     'speakerphone.mic',
@@ -46,14 +74,347 @@ READERS = [
     'camera.points'  # Point cloud data
 ]
 
+# Topics recorded for /api/history, with the bytes of records kept for each. They are
+# small and recorded from startup, like the audio rings; FLOW_HISTORY=0 records them
+# only while something reads them (see main)
+HISTORY_BUDGETS = {
+    'drive.state': 4 << 20,
+    'drive.status': 1 << 20,
+    'led_strip.ctrl': 1 << 20,
+    'transcript': 1 << 20,
+}
+HISTORY_MAX_POINTS = 1000  # default decimation target of a history query
+
+READER_LINGER = 5.0  # seconds a reader stays open after its last subscriber leaves
+READER_RETRY = 1.0   # seconds between attempts to open a reader that failed
+READER_POLL = 0.001  # seconds the reader loop waits after a pass in which no reader was ready
+SHARED_SLOTS = 8     # records kept per topic in split mode (see SharedRing)
+SHARED_POLL = 0.001  # seconds between polls of the shared rings in split mode
+SHARED_COPY = 65536  # records up to this many bytes are copied out of the shared rings
+STATE_RETRY = 0.1  # seconds between reads of a dashboard state source that had nothing yet
+
 # Daemon names for status checking
+PROCESS_YOUNG = 10.0  # seconds after start a process's cmdline is still re-read (wrappers that exec)
+PROCESS_RESCAN = 30   # ProcessIndex refreshes between re-reading every cmdline
 DAEMON_NAMES = ['camera', 'drive', 'led_strip', 'speakerphone', 'transcriber', 'depth']
 
-# Global queues for writer data
-queues = {}
+def record_time(data):
+    """A record's `timestamp` field as epoch seconds, or None if it has none."""
+    names = getattr(getattr(data, 'dtype', None), 'names', None)
+    if not names or 'timestamp' not in names:
+        return None
+    value = np.asarray(data['timestamp'])
+    if np.issubdtype(value.dtype, np.datetime64):
+        return int(value.astype('datetime64[ns]').astype(np.int64)) / 1e9
+    return float(value)
+
+class TopicStats:
+    """Rolling arrival statistics for one topic, updated on the reader thread.
+
+    Keeps the last WINDOW inter-arrival intervals and record ages (time from
+    the record's own timestamp to when flow read it) in preallocated arrays.
+    """
+
+    WINDOW = 256
+
+    def __init__(self):
+        self.intervals = np.zeros(self.WINDOW)
+        self.ages = np.full(self.WINDOW, np.nan)
+        self.count = 0
+        self.last = None  # monotonic time of the last record
+        self.dropped = 0  # records a subscriber skipped because a newer one replaced them
+
+    def record(self, data) -> None:
+        now = time.monotonic()
+        i = self.count % self.WINDOW
+        self.intervals[i] = now - self.last if self.last is not None else np.nan
+        ts = record_time(data)
+        self.ages[i] = time.time() - ts if ts is not None else np.nan
+        self.last = now
+        self.count += 1
+
+    def summary(self, period_ms: float = 0) -> Dict[str, Any]:
+        n = min(self.count, self.WINDOW)
+        intervals = self.intervals[:n][~np.isnan(self.intervals[:n])]
+        ages = self.ages[:n][~np.isnan(self.ages[:n])]
+        last_age = self.ages[(self.count - 1) % self.WINDOW] if self.count else np.nan
+        def percentiles(values):
+            if not len(values):
+                return None
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            return {'p50': p50 * 1e3, 'p90': p90 * 1e3, 'p99': p99 * 1e3, 'max': values.max() * 1e3}
+        return {
+            'records': self.count,
+            'rate_hz': 1.0 / intervals.mean() if len(intervals) and intervals.mean() > 0 else 0.0,
+            'expected_hz': 1000.0 / period_ms if period_ms else None,
+            'interval_ms': percentiles(intervals),
+            'jitter_ms': intervals.std() * 1e3 if len(intervals) else None,
+            'age_ms': percentiles(ages),
+            'last_age_ms': last_age * 1e3 if not np.isnan(last_age) else None,
+            'staleness_s': time.monotonic() - self.last if self.last is not None else None,
+            'dropped': self.dropped,
+        }
+
+class Topic:
+    """Latest-value slot for one writer, shared by every subscriber.
+
+    The reader thread publishes into the slot; subscribers keep their own
+    sequence cursor and are woken through an asyncio event on the UI loop, so
+    N clients cost one read per frame instead of N competing queue reads.
+    """
+
+    def __init__(self, name: str, loop=None):
+        self.name = name
+        self.slot = (0, None)  # (seq, data), swapped atomically
+        self.loop = loop
+        self.waiting = 0
+        self.subscribers = 0
+        self.idle_since = time.monotonic()
+        self.sinks = []  # callables fed every record on the reader thread
+        self.stats = TopicStats()
+        self.guards = {}  # seq -> whether that shared memory view is still intact (split mode)
+        self._changed = asyncio.Event()
+
+    def publish(self, data, intact=None) -> None:
+        """Store a new record and wake subscribers (called from the reader thread).
+
+        `intact` is passed for views that can be overwritten in place, see
+        Topic.intact.
+        """
+        seq = self.slot[0] + 1
+        if intact is not None:
+            self.guards[seq] = intact
+            self.guards.pop(seq - SHARED_SLOTS, None)
+        self.slot = (seq, data)
+        self.stats.record(data)
+        for sink in self.sinks:
+            sink(data)
+        if self.waiting and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._wake)
+
+    def latest(self):
+        """Return the current (seq, data) without waiting."""
+        return self.slot
+
+    def intact(self, seq: int) -> bool:
+        """Whether record `seq` is unchanged since it was published.
+
+        Split mode publishes large records as views of a SharedRing, which the
+        reader process may overwrite while a lagging subscriber still encodes
+        one; check after encoding and drop the frame if this is False.
+        """
+        if not self.guards:
+            return True
+        guard = self.guards.get(seq)
+        # Guards only outlive SHARED_SLOTS publishes, the ring has wrapped past older ones
+        return guard() if guard is not None else seq > self.slot[0] - SHARED_SLOTS
+
+    def clear(self) -> None:
+        """Drop the held record when its reader closes, keeping the sequence."""
+        self.slot = (self.slot[0], None)
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, cursor: int, paced: bool = False):
+        """Wait for a record newer than `cursor` and return (seq, data).
+
+        Intermediate records are skipped: a slow subscriber always gets the
+        most recent one. Skips count as dropped, except for `paced`
+        subscribers, which skip on purpose between frames; for them only
+        records coalesced while they were already waiting count.
+        """
+        self.waiting += 1
+        try:
+            if paced:
+                cursor = max(cursor, self.slot[0] - 1)
+            while self.slot[0] <= cursor or self.slot[1] is None:
+                await self._changed.wait()
+            slot = self.slot
+            if cursor and slot[0] - cursor > 1:
+                self.stats.dropped += slot[0] - cursor - 1
+            return slot
+        finally:
+            self.waiting -= 1
+
+class Hub:
+    """Fan-out of reader data to any number of async subscribers.
+
+    Topics are created on first subscription. The reader thread keeps a
+    Reader open for every topic that has subscribers (see read_loop) and is
+    woken through `changed` when that set changes.
+    """
+
+    def __init__(self):
+        self.topics: Dict[str, Topic] = {}
+        self.loop = None
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.topics
+
+    def __getitem__(self, name: str) -> Topic:
+        return self.topics[name]
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach the UI event loop that subscribers wait on."""
+        with self.lock:
+            self.loop = loop
+            for topic in self.topics.values():
+                topic.loop = loop
+
+    def topic(self, name: str) -> Topic:
+        """Get or create a topic without subscribing to it (e.g. to attach a sink)."""
+        with self.lock:
+            topic = self.topics.get(name)
+            if topic is None:
+                topic = self.topics[name] = Topic(name, self.loop)
+            return topic
+
+    def subscribe(self, name: str) -> Topic:
+        """Register interest in a topic, opening its reader if needed."""
+        topic = self.topic(name)
+        with self.lock:
+            topic.subscribers += 1
+        self.changed.set()
+        return topic
+
+    def unsubscribe(self, topic: Topic) -> None:
+        with self.lock:
+            topic.subscribers -= 1
+            if not topic.subscribers:
+                topic.idle_since = time.monotonic()
+        self.changed.set()
+
+    def snapshot(self) -> List[Topic]:
+        with self.lock:
+            return list(self.topics.values())
+
+# Global hub for writer data
+hub = Hub()
+
+class AudioRing:
+    """Preallocated ring holding the last `ms` of an audio writer.
+
+    Chunks are copied in with at most two slice assignments, so recording
+    allocates nothing per chunk.
+    """
+
+    def __init__(self, sample_rate: int, channels: int, ms: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.buffer = np.zeros((sample_rate * ms // 1000, channels), dtype=np.int16)
+        self.written = 0  # total frames written
+        self.lock = threading.Lock()
+
+    def write(self, data) -> None:
+        """Append a record's audio (called from the reader thread)."""
+        audio = np.asarray(data['audio']).reshape(-1, self.channels)
+        size = len(self.buffer)
+        if len(audio) > size:
+            audio = audio[-size:]
+        with self.lock:
+            start = self.written % size
+            first = min(len(audio), size - start)
+            self.buffer[start:start + first] = audio[:first]
+            self.buffer[:len(audio) - first] = audio[first:]
+            self.written += len(audio)
+
+    def read(self, ms: int) -> List[bytes]:
+        """Copy out the last `ms` of audio as one or two contiguous segments, oldest first."""
+        size = len(self.buffer)
+        with self.lock:
+            n = min(self.sample_rate * ms // 1000, self.written, size)
+            start = (self.written - n) % size
+            if start + n <= size:
+                return [self.buffer[start:start + n].tobytes()]
+            return [self.buffer[start:].tobytes(), self.buffer[:start + n - size].tobytes()]
+
+audio_rings = {
+    name: AudioRing(AUDIO_SAMPLE_RATES[name], AUDIO_CHANNELS[name], AUDIO_BUFFER_MS)
+    for name in AUDIO_SAMPLE_RATES
+}
+
+class TopicHistory:
+    """Recent records of one topic in preallocated arrays, oldest evicted first.
+
+    The arrays are sized from a byte budget when the first record arrives,
+    since the writer's dtype isn't known before, and reallocated (dropping
+    the history) if it changes. Each record is stored with its timestamp, or
+    its arrival time if it has none.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.records = None
+        self.times = None
+        self.count = 0  # total records written
+        self.lock = threading.Lock()
+
+    def write(self, data) -> None:
+        """Append a record (called from the reader thread)."""
+        ts = record_time(data)
+        if ts is None:
+            ts = time.time()
+        with self.lock:
+            if self.records is None or self.records.dtype != data.dtype:
+                capacity = self.budget // (data.dtype.itemsize + 8)
+                if not capacity:
+                    return
+                self.records = np.zeros(capacity, dtype=data.dtype)
+                self.times = np.zeros(capacity)
+                self.count = 0
+            i = self.count % len(self.records)
+            self.records[i] = data
+            self.times[i] = ts
+            self.count += 1
+
+    def query(self, since: float, until: float, max_points: int):
+        """Copy out records timed within [since, until], oldest first.
+
+        Returns (total matched, seqs, times, records); beyond `max_points`
+        matches, evenly spaced records are kept.
+        """
+        with self.lock:
+            if self.records is None:
+                return 0, np.zeros(0, np.uint64), np.zeros(0), None
+            n = min(self.count, len(self.records))
+            seqs = np.arange(self.count - n, self.count)
+            idx = seqs % len(self.records)
+            times = self.times[idx]
+            match = (times >= since) & (times <= until)
+            seqs, idx, times = seqs[match], idx[match], times[match]
+            total = len(idx)
+            if total > max_points:
+                keep = np.linspace(0, total - 1, max(max_points, 1)).round().astype(np.intp)
+                seqs, idx, times = seqs[keep], idx[keep], times[keep]
+            return total, (seqs + 1).astype(np.uint64), times, self.records[idx]
+
+histories = {name: TopicHistory(budget) for name, budget in HISTORY_BUDGETS.items()}
+
+def wav_header(num_bytes: int, sample_rate: int, channels: int) -> bytes:
+    """44-byte RIFF header for 16-bit PCM."""
+    return struct.pack('<4sI4s4sIHHIIHH4sI',
+                       b'RIFF', 36 + num_bytes, b'WAVE',
+                       b'fmt ', 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+                       b'data', num_bytes)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bind the hub to the UI loop and run background services."""
+    hub.bind(asyncio.get_running_loop())
+    sampler.start()
+    tasks = [asyncio.create_task(discovery.run()), asyncio.create_task(process_index.run()),
+             asyncio.create_task(state_watcher.run())]
+    yield
+    for task in tasks:
+        task.cancel()
+    sampler.stop()
 
 # FastAPI app instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -64,105 +425,326 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_writer_metadata() -> Dict[str, Any]:
-    """Get metadata about active writers from unix sockets."""
-    def get_data(sock: str):
+def list_writer_sockets(path: str = '/proc/net/unix') -> Dict[str, int]:
+    """Map listening abstract `.bbos` socket names to their inode.
+
+    Parses /proc/net/unix in-process (columns: Num RefCount Protocol Flags
+    Type St Inode Path) instead of forking awk on every request.
+    """
+    sockets = {}
+    with open(path) as f:
+        next(f, None)  # header
+        for line in f:
+            fields = line.split()
+            if len(fields) < 8 or fields[5] != '01':
+                continue
+            name = fields[7]
+            if name.startswith('@') and name.endswith('.bbos') and 'timelog' not in name:
+                sockets[name[1:]] = int(fields[6])
+    return sockets
+
+class WriterDiscovery:
+    """Background discovery of active writers from their unix sockets.
+
+    Each writer's metadata is probed once per listening socket inode and
+    cached for `ttl` seconds, with new sockets probed concurrently, so
+    /api/writers is served from memory without touching the sockets.
+    """
+
+    def __init__(self, interval: float = 1.0, ttl: float = 30.0, timeout: float = 0.1):
+        self.interval = interval
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache: Dict[int, tuple] = {}  # inode -> (expires, metadata or None)
+        self.writers: Dict[str, Any] = {}
+        self.ready = asyncio.Event()
+
+    async def probe(self, sock: str):
+        """Read the metadata a writer sends to every new connection."""
+        loop = asyncio.get_running_loop()
         s = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
-        res = s.connect_ex(f'\0{sock}')
-        s.settimeout(0.1)
-        data = None
-        if res == 0:
-            try:
-                data = s.recv(1024)
-            except socket.timeout:
-                pass
-        s.close()
-        return data
-
-    # Use /proc/net/unix to find LISTEN state abstract sockets ending in .bbos
-    awk_prog = 'NR>1 && $6=="01" && $NF ~ /^@.*\.bbos$/ {sub(/^@/, "", $NF); print $NF}'
-    result = subprocess.run(["awk", awk_prog, "/proc/net/unix"], capture_output=True, text=True)
-    sockets = result.stdout.splitlines()
-    
-    writer_metadata = {}
-    
-    for sock in sockets:
+        s.setblocking(False)
+        try:
+            await asyncio.wait_for(loop.sock_connect(s, f'\0{sock}'), self.timeout)
+            data = await asyncio.wait_for(loop.sock_recv(s, 1024), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        finally:
+            s.close()
+        try:
+            info = json.loads(data)
+        except ValueError:
+            return None
         w = sock.split("__")[0].replace(".bbos", "")
-        if "timelog" not in sock:
-            data = get_data(sock)
-            if data:
-                try:
-                    info = json.loads(data)
-                    writer_metadata[w] = {
-                        'name': w,
-                        'caller': info.get('caller', 'Unknown'),
-                        'owner': info.get('owner', 'Unknown'),
-                        'period': info.get('period', 0),
-                        'dtype': info.get('dtype', [])
-                    }
-                except:
-                    pass
-    
-    return writer_metadata
+        return {
+            'name': w,
+            'caller': info.get('caller', 'Unknown'),
+            'owner': info.get('owner', 'Unknown'),
+            'period': info.get('period', 0),
+            'dtype': info.get('dtype', [])
+        }
 
-def get_system_metrics() -> Dict[str, Any]:
-    """Get system performance metrics."""
-    try:
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+    async def refresh(self) -> None:
+        """Rescan the socket table and probe sockets that are new or expired."""
+        sockets = list_writer_sockets()
+        now = time.monotonic()
+        stale = [(sock, inode) for sock, inode in sockets.items()
+                 if inode not in self.cache or self.cache[inode][0] < now]
+        results = await asyncio.gather(*(self.probe(sock) for sock, _ in stale))
+        for (_, inode), meta in zip(stale, results):
+            # Retry failed probes on the next scan
+            self.cache[inode] = (now + (self.ttl if meta else 0.0), meta)
+        live = set(sockets.values())
+        self.cache = {inode: entry for inode, entry in self.cache.items() if inode in live}
+        writers = {}
+        for inode in sockets.values():
+            meta = self.cache[inode][1]
+            if meta:
+                writers[meta['name']] = meta
+        self.writers = writers
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error discovering writers: {e}")
+            self.ready.set()
+            await asyncio.sleep(self.interval)
+
+discovery = WriterDiscovery()
+
+# One system metrics sample; top processes are stored as (pid, cpu) pairs
+TOP_PROCESSES = 5
+SYSTEM_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('cpu', '<f4'),
+    ('memory_used', '<u8'),
+    ('memory_percent', '<f4'),
+    ('swap_used', '<u8'),
+    ('swap_percent', '<f4'),
+    ('load_avg', '<f4', (3,)),
+    ('top_pid', '<i4', (TOP_PROCESSES,)),
+    ('top_cpu', '<f4', (TOP_PROCESSES,)),
+])
+
+class SystemSampler:
+    """Sample system metrics on a background thread into a fixed-size ring buffer.
+
+    Request handlers only copy out of the ring, so none of them wait on
+    psutil (cpu_percent is measured between samples, not over a blocking
+    interval).
+    """
+
+    def __init__(self, period: float = 1.0, history_seconds: float = 600.0):
+        self.period = period
+        self.ring = np.zeros(int(history_seconds / period), dtype=SYSTEM_DTYPE)
+        self.count = 0  # total samples written
+        self.names: Dict[int, str] = {}  # pid -> name for the latest top processes
+        self.totals: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        psutil.cpu_percent(interval=None)  # prime the counters
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Error sampling system metrics: {e}")
+            deadline += self.period
+            self._stop.wait(max(0.0, deadline - time.monotonic()))
+
+    def sample(self) -> None:
         memory = psutil.virtual_memory()
         swap = psutil.swap_memory()
-        load_avg = os.getloadavg()
         
-        # Get top processes by CPU
+        # process_iter reuses its Process objects, so cpu_percent is since the last sample
         processes = []
+        names = {}
         for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-            try:
-                pinfo = proc.info
-                if pinfo['cpu_percent'] > 0:
-                    processes.append({
-                        'pid': pinfo['pid'],
-                        'name': pinfo['name'],
-                        'cpu': pinfo['cpu_percent']
-                    })
-            except:
-                pass
-        
-        processes.sort(key=lambda x: x['cpu'], reverse=True)
+            pinfo = proc.info
+            if pinfo['cpu_percent']:
+                processes.append((pinfo['cpu_percent'], pinfo['pid']))
+                names[pinfo['pid']] = pinfo['name']
+        processes.sort(reverse=True)
+        processes = processes[:TOP_PROCESSES]
         
+        record = np.zeros((), dtype=SYSTEM_DTYPE)
+        record['time'] = time.time()
+        record['cpu'] = psutil.cpu_percent(interval=None)
+        record['memory_used'] = memory.used
+        record['memory_percent'] = memory.percent
+        record['swap_used'] = swap.used
+        record['swap_percent'] = swap.percent
+        record['load_avg'] = os.getloadavg()
+        record['top_pid'][:len(processes)] = [pid for _, pid in processes]
+        record['top_cpu'][:len(processes)] = [cpu for cpu, _ in processes]
+        with self.lock:
+            self.ring[self.count % len(self.ring)] = record
+            self.count += 1
+            self.names = {pid: names[pid] for _, pid in processes}
+            self.totals = {'cpu_count': psutil.cpu_count(), 'memory': memory.total, 'swap': swap.total}
+
+    def history(self, seconds: float) -> np.ndarray:
+        """Copy of the samples from the last `seconds`, oldest first.
+
+        `seconds` is clamped to the ring's span first, so inf returns every
+        sample and NaN or a negative value none.
+        """
+        seconds = min(seconds, len(self.ring) * self.period) if seconds > 0 else 0.0
+        with self.lock:
+            n = min(self.count, len(self.ring), int(np.ceil(seconds / self.period)))
+            return self.ring[np.arange(self.count - n, self.count) % len(self.ring)]
+
+    def latest(self) -> Dict[str, Any]:
+        """Most recent sample in the /api/system format."""
+        with self.lock:
+            if not self.count:
+                return {'error': 'no samples yet'}
+            record = self.ring[(self.count - 1) % len(self.ring)].copy()
+            names = dict(self.names)
+            totals = self.totals
+        top = [
+            {'pid': int(pid), 'name': names.get(int(pid), ''), 'cpu': float(cpu)}
+            for pid, cpu in zip(record['top_pid'], record['top_cpu'])
+            if cpu > 0
+        ]
         return {
             'cpu': {
-                'percent': cpu_percent,
-                'count': psutil.cpu_count()
+                'percent': float(record['cpu']),
+                'count': totals['cpu_count']
             },
             'memory': {
-                'total': memory.total,
-                'used': memory.used,
-                'percent': memory.percent
+                'total': totals['memory'],
+                'used': int(record['memory_used']),
+                'percent': float(record['memory_percent'])
             },
             'swap': {
-                'total': swap.total,
-                'used': swap.used,
-                'percent': swap.percent
+                'total': totals['swap'],
+                'used': int(record['swap_used']),
+                'percent': float(record['swap_percent'])
             },
-            'load_avg': load_avg,
-            'top_processes': processes[:5]
+            'load_avg': record['load_avg'].tolist(),
+            'top_processes': top
         }
-    except Exception as e:
-        return {'error': str(e)}
 
-def get_daemon_status(daemon_name: str) -> str:
-    """Check if a daemon is running."""
-    try:
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+sampler = SystemSampler()
+
+class ProcessIndex:
+    """Incrementally maintained pid -> cmdline index of running processes.
+
+    Each refresh lists pids and checks every known pid's create time, so an
+    exited or reused pid is dropped, but only reads the cmdline of pids that
+    are new, started less than PROCESS_YOUNG seconds ago (a wrapper may
+    still exec the real program), or due for the full re-read every
+    PROCESS_RESCAN refreshes. Processes matching a tag (all of its words in
+    the cmdline) are tracked per tag.
+    """
+
+    def __init__(self, tags: Dict[str, tuple], interval: float = 1.0):
+        self.tags = tags
+        self.interval = interval
+        self.procs: Dict[int, tuple] = {}  # pid -> (create_time, cmdline)
+        self.tagged: Dict[str, set] = {tag: set() for tag in tags}
+        self.ready = False
+        self.refreshes = 0
+        self.lock = threading.Lock()
+
+    def _read(self, pid: int):
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                create_time = proc.create_time()
+                try:
+                    cmdline = ' '.join(proc.cmdline())
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    cmdline = ''
+            return create_time, cmdline
+        except psutil.NoSuchProcess:
+            return None
+
+    def refresh(self) -> None:
+        """Apply the pids that started, exited or changed since the last refresh."""
+        pids = set(psutil.pids())
+        with self.lock:
+            known = dict(self.procs)
+        self.refreshes += 1
+        full = self.refreshes % PROCESS_RESCAN == 0
+        now = time.time()
+        exited = set(known) - pids
+        reread = set()
+        for pid, (create_time, _) in known.items():
+            if pid in exited:
+                continue
             try:
-                cmdline = proc.info.get('cmdline', [])
-                if cmdline and 'daemon.py' in ' '.join(cmdline) and daemon_name in ' '.join(cmdline):
-                    return 'running'
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                if psutil.Process(pid).create_time() != create_time:
+                    exited.add(pid)  # reused
+                    continue
+            except psutil.NoSuchProcess:
+                exited.add(pid)
                 continue
-        return 'stopped'
-    except Exception:
+            if full or now - create_time < PROCESS_YOUNG:
+                reread.add(pid)
+        started = {pid: self._read(pid) for pid in (pids - set(known)) | exited | reread if pid in pids}
+        with self.lock:
+            for pid in exited | reread:
+                self.procs.pop(pid, None)
+                for members in self.tagged.values():
+                    members.discard(pid)
+            for pid, entry in started.items():
+                if entry is None:
+                    continue
+                self.procs[pid] = entry
+                for tag, words in self.tags.items():
+                    if all(word in entry[1] for word in words):
+                        self.tagged[tag].add(pid)
+            self.ready = True
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"Error refreshing process index: {e}")
+            await asyncio.sleep(self.interval)
+
+    def running(self, tag: str) -> bool:
+        with self.lock:
+            return bool(self.tagged[tag])
+
+    def find(self, *words: str) -> List[int]:
+        """Pids whose cmdline contains all `words`."""
+        with self.lock:
+            return [pid for pid, (_, cmdline) in self.procs.items()
+                    if all(word in cmdline for word in words)]
+
+# Daemons are the `daemon.py` processes whose cmdline mentions the daemon name
+process_index = ProcessIndex({name: ('daemon.py', name) for name in DAEMON_NAMES})
+
+def get_daemon_status(daemon_name: str) -> str:
+    """Check if a daemon is running."""
+    if not process_index.ready:
         return 'unknown'
+    return 'running' if process_index.running(daemon_name) else 'stopped'
+
+def skip_field(dtype: np.dtype, field_name: str, skip_jpeg: bool = False) -> bool:
+    """Whether a record field is left out of WebSocket messages."""
+    # Skip JPEG data if requested (for MJPEG streaming)
+    if field_name == 'jpeg' and skip_jpeg:
+        return True
+    # Skip large point cloud arrays (served by the binary point cloud socket)
+    return field_name in ['points', 'colors'] and 'num_points' in dtype.names
 
 def convert_numpy_to_json(data, skip_jpeg=False):
     """Convert numpy structured array to JSON-serializable dict."""
@@ -173,13 +755,7 @@ def convert_numpy_to_json(data, skip_jpeg=False):
         for field_name in data.dtype.names:
             value = data[field_name]
             
-            # Skip JPEG data if requested (for MJPEG streaming)
-            if field_name == 'jpeg' and skip_jpeg:
-                continue
-            
-            # Skip large point cloud arrays to avoid JSON bloat
-            if field_name in ['points', 'colors'] and 'num_points' in data.dtype.names:
-                # Don't send the actual arrays for point clouds
+            if skip_field(data.dtype, field_name, skip_jpeg):
                 continue
             
             if isinstance(value, np.ndarray):
@@ -216,6 +792,144 @@ def convert_numpy_to_json(data, skip_jpeg=False):
     
     return json_data
 
+def _json_default(value):
+    """Fallback for values orjson can't serialize natively (e.g. float16 arrays)."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _json_field_converter(name: str, field: np.dtype):
+    """Pick how one field is turned into a JSON value, decided once per dtype."""
+    if field.shape:
+        # Flatten mono audio from (samples, 1) to (samples,)
+        if name == 'audio' and field.base == np.int16 and len(field.shape) == 2 and field.shape[1] == 1:
+            return lambda value: value.reshape(-1)
+        # orjson writes numpy arrays directly
+        return None
+    if field.kind == 'S':
+        # Byte strings (like text from transcriber)
+        return lambda value: value.item().decode('utf-8', errors='replace').strip()
+    if field.kind == 'M':
+        return str
+    return lambda value: value.item()
+
+class JsonEncoder:
+    """Serialize records of one writer dtype to JSON text.
+
+    The field plan (which fields to skip, how to convert each one) is built
+    once from the dtype instead of being re-derived for every message.
+    """
+
+    def __init__(self, writer: str, dtype: np.dtype, skip_jpeg: bool = False):
+        self.writer = writer
+        self.source = dtype
+        self.plan = [
+            (name, _json_field_converter(name, dtype[name]))
+            for name in dtype.names
+            if not skip_field(dtype, name, skip_jpeg)
+        ]
+
+    def convert(self, data) -> Dict[str, Any]:
+        json_data = {}
+        for name, convert in self.plan:
+            value = data[name]
+            json_data[name] = value if convert is None else convert(value)
+        return json_data
+
+    def encode(self, data) -> str:
+        json_data = self.convert(data)
+        return orjson.dumps({
+            'writer': self.writer,
+            'data': json_data,
+            'timestamp': str(json_data.get('timestamp', datetime.now().isoformat()))
+        }, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+_json_encoders: Dict[tuple, JsonEncoder] = {}
+
+def json_encoder(writer: str, dtype: np.dtype, skip_jpeg: bool = False) -> JsonEncoder:
+    """Get the cached JsonEncoder for a (writer, dtype) pair."""
+    key = (writer, dtype, skip_jpeg)
+    encoder = _json_encoders.get(key)
+    if encoder is None:
+        encoder = _json_encoders[key] = JsonEncoder(writer, dtype, skip_jpeg=skip_jpeg)
+    return encoder
+
+# Binary record frames: header (seq uint64, timestamp float64 seconds) + raw record bytes
+BINARY_HEADER = struct.Struct('<Qd')
+
+class BinaryEncoder:
+    """Pack records of one structured dtype as raw bytes for binary WebSocket clients.
+
+    The client receives `schema()` once as JSON, then every record as
+    BINARY_HEADER followed by the record bytes laid out as described there.
+    Skipped fields are dropped by repacking into a smaller dtype.
+    """
+
+    def __init__(self, dtype: np.dtype, skip_jpeg: bool = False):
+        self.source = dtype
+        self.names = [n for n in dtype.names if not skip_field(dtype, n, skip_jpeg)]
+        self.full = len(self.names) == len(dtype.names)
+        self.dtype = dtype if self.full else np.dtype([(n, dtype[n]) for n in self.names])
+        self.timestamp = 'timestamp' if 'timestamp' in self.names else None
+
+    def schema(self) -> Dict[str, Any]:
+        """Field layout of the record bytes following the header."""
+        return {
+            'header': {'format': BINARY_HEADER.format, 'size': BINARY_HEADER.size},
+            'itemsize': self.dtype.itemsize,
+            'fields': [
+                {
+                    'name': n,
+                    'type': self.dtype[n].base.str,
+                    'shape': list(self.dtype[n].shape),
+                    'offset': self.dtype.fields[n][1],
+                }
+                for n in self.names
+            ],
+        }
+
+    def encode(self, seq: int, data) -> bytes:
+        record = np.asarray(data)
+        if not self.full:
+            packed = np.empty((), dtype=self.dtype)
+            for n in self.names:
+                packed[n] = record[n]
+            record = packed
+        ts = record_time(record) if self.timestamp is not None else None
+        if ts is None:
+            ts = time.time()
+        return BINARY_HEADER.pack(seq, ts) + record.tobytes()
+
+class EnvelopeReducer:
+    """Reduce an audio stream to per-pixel (min, max, rms) buckets.
+
+    Samples that don't fill a whole bucket are carried over to the next
+    chunk, so bucket boundaries stay continuous across chunks.
+    """
+
+    def __init__(self, samples_per_bucket: int):
+        self.samples_per_bucket = samples_per_bucket
+        self.carry = np.empty(0, dtype=np.int16)
+
+    def push(self, audio: np.ndarray) -> np.ndarray:
+        """Reduce one chunk (first channel) to an (n, 3) int16 array of new buckets."""
+        samples = audio[:, 0] if audio.ndim == 2 else audio
+        if self.carry.size:
+            samples = np.concatenate((self.carry, samples))
+        n = samples.size - samples.size % self.samples_per_bucket
+        self.carry = samples[n:].copy()
+        blocks = samples[:n].reshape(-1, self.samples_per_bucket)
+        envelope = np.empty((blocks.shape[0], 3), dtype=np.int16)
+        envelope[:, 0] = blocks.min(axis=1)
+        envelope[:, 1] = blocks.max(axis=1)
+        rms = np.sqrt(np.mean(np.square(blocks, dtype=np.float32), axis=1))
+        envelope[:, 2] = np.minimum(rms, np.iinfo(np.int16).max)
+        return envelope
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the frontend HTML."""
@@ -225,16 +939,15 @@ async def root():
 @app.get("/api/writers")
 async def get_writers():
     """Get metadata for all active writers."""
-    return get_writer_metadata()
+    await discovery.ready.wait()
+    return discovery.writers
 
 @app.get("/api/readers")
 async def get_readers():
     """Get list of readers configured for this app."""
     return READERS
 
-@app.get("/api/daemons")
-async def get_daemons():
-    """Get status of all daemons."""
+def daemon_states() -> Dict[str, Dict[str, str]]:
     return {
         name: {
             'name': name,
@@ -243,32 +956,158 @@ async def get_daemons():
         for name in DAEMON_NAMES
     }
 
+@app.get("/api/daemons")
+async def get_daemons():
+    """Get status of all daemons."""
+    return daemon_states()
+
 @app.get("/api/system")
 async def get_system():
-    """Get system metrics."""
-    return get_system_metrics()
+    """Get the latest system metrics sample."""
+    return sampler.latest()
 
-@app.get("/api/pointcloud/status")
-async def get_pointcloud_status():
-    """Get current point cloud status."""
-    if 'camera.points' in queues:
+@app.get("/api/system/history")
+async def get_system_history(seconds: float = 60):
+    """Get system metrics samples from the last N seconds as columns."""
+    samples = sampler.history(seconds)
+    return Response(orjson.dumps({
+        'period': sampler.period,
+        'time': samples['time'],
+        'cpu': samples['cpu'],
+        'memory_percent': samples['memory_percent'],
+        'swap_percent': samples['swap_percent'],
+        'load_avg': samples['load_avg'],
+    }, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY), media_type='application/json')
+
+async def topic_available(name: str) -> bool:
+    """Whether clients may subscribe to `name`: a default topic or any discovered writer."""
+    if name in READERS:
+        return True
+    await discovery.ready.wait()
+    return name in discovery.writers
+
+@app.get("/api/audio/{topic}.wav")
+async def get_audio_snapshot(topic: str, ms: int = AUDIO_BUFFER_MS):
+    """Stream the last `ms` of an audio writer from its ring buffer as a WAV file."""
+    ring = audio_rings.get(topic)
+    if ring is None:
+        return Response(status_code=404)
+    segments = ring.read(max(0, min(ms, AUDIO_BUFFER_MS)))
+    header = wav_header(sum(len(seg) for seg in segments), ring.sample_rate, ring.channels)
+    async def generate():
+        yield header
+        for seg in segments:
+            yield seg
+    return StreamingResponse(generate(), media_type='audio/wav', headers={
+        'Content-Disposition': f'inline; filename="{topic}.wav"'
+    })
+
+def history_columns(records: np.ndarray) -> Dict[str, Any]:
+    """One JSON-ready column per field of a history query result."""
+    columns = {}
+    for name in records.dtype.names:
+        field = records.dtype[name]
+        if skip_field(records.dtype, name, skip_jpeg=True):
+            continue
+        column = records[name]
+        if field.kind == 'S':
+            columns[name] = [v.decode('utf-8', errors='replace').strip() for v in column.tolist()]
+        elif field.kind == 'M':
+            columns[name] = np.datetime_as_string(column).tolist()
+        elif name == 'audio' and field.shape[-1:] == (1,):
+            columns[name] = column.reshape(len(column), -1)
+        else:
+            # Field views of a structured array are strided; orjson needs contiguous arrays
+            columns[name] = np.ascontiguousarray(column)
+    return columns
+
+@app.get("/api/history/{writer}")
+async def get_history(writer: str, since: float = 0, until: float = None,
+                      max_points: int = HISTORY_MAX_POINTS, format: str = 'json'):
+    """Get a writer's recorded records with timestamps in [since, until] (epoch seconds).
+
+    At most `max_points` evenly spaced records are returned. JSON results
+    are columns per field; `?format=binary` returns the records as
+    back-to-back BinaryEncoder frames, with their schema in the
+    X-Record-Schema header.
+    """
+    history = histories.get(writer)
+    if history is None:
+        return Response(status_code=404)
+    total, seqs, times, records = history.query(since, until if until is not None else np.inf, max_points)
+    if format == 'binary':
+        headers = {'X-Record-Count': str(len(seqs)), 'X-Record-Total': str(total)}
+        if records is None:
+            return Response(b'', media_type='application/octet-stream', headers=headers)
+        encoder = BinaryEncoder(records.dtype, skip_jpeg=True)
+        frames = np.empty(len(records), dtype=[('seq', '<u8'), ('time', '<f8'), ('record', encoder.dtype)])
+        frames['seq'] = seqs
+        frames['time'] = times
+        for name in encoder.names:
+            frames['record'][name] = records[name]
+        headers['X-Record-Schema'] = orjson.dumps(encoder.schema()).decode()
+        return Response(frames.tobytes(), media_type='application/octet-stream', headers=headers)
+    return Response(orjson.dumps({
+        'writer': writer,
+        'total': total,
+        'time': times,
+        'data': history_columns(records) if records is not None else {},
+    }, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY), media_type='application/json')
+
+def topic_stats() -> Dict[str, Any]:
+    """Stats for every topic flow has read, against the writer's nominal period."""
+    writers = discovery.writers
+    stats = {}
+    for topic in hub.snapshot():
+        summary = topic.stats.summary(writers.get(topic.name, {}).get('period', 0))
+        summary['subscribers'] = topic.subscribers
+        stats[topic.name] = summary
+    return stats
+
+@app.get("/api/stats")
+async def get_stats():
+    """Get per-topic rate, jitter, staleness and drop statistics."""
+    return Response(orjson.dumps(topic_stats(), option=orjson.OPT_SERIALIZE_NUMPY),
+                    media_type='application/json')
+
+@app.get("/metrics")
+async def get_metrics():
+    """Per-topic statistics in the Prometheus text exposition format."""
+    metrics = {
+        'flow_topic_records_total': ('counter', 'Records read', lambda s: s['records']),
+        'flow_topic_dropped_total': ('counter', 'Records skipped by slow subscribers', lambda s: s['dropped']),
+        'flow_topic_subscribers': ('gauge', 'Connected subscribers', lambda s: s['subscribers']),
+        'flow_topic_rate_hz': ('gauge', 'Observed record rate', lambda s: s['rate_hz']),
+        'flow_topic_expected_rate_hz': ('gauge', 'Rate implied by the writer period', lambda s: s['expected_hz']),
+        'flow_topic_jitter_seconds': ('gauge', 'Standard deviation of inter-arrival time', lambda s: s['jitter_ms'] and s['jitter_ms'] / 1e3),
+        'flow_topic_staleness_seconds': ('gauge', 'Time since the last record', lambda s: s['staleness_s']),
+    }
+    quantiles = {
+        'flow_topic_interval_seconds': ('Inter-arrival time', 'interval_ms'),
+        'flow_topic_record_age_seconds': ('Record age when read', 'age_ms'),
+    }
+    stats = topic_stats()
+    lines = []
+    for name, (kind, help_text, value) in metrics.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for topic, summary in stats.items():
+            v = value(summary)
+            if v is not None:
+                lines.append(f'{name}{{topic="{topic}"}} {float(v)}')
+    for name, (help_text, key) in quantiles.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+        for topic, summary in stats.items():
+            if summary[key] is None:
+                continue
+            for q in ('p50', 'p90', 'p99'):
+                lines.append(f'{name}{{topic="{topic}",quantile="0.{q[1:]}"}} {summary[key][q] / 1e3}')
+    return PlainTextResponse("\n".join(lines) + "\n", media_type='text/plain; version=0.0.4')
+
+def pointcloud_status() -> Dict[str, Any]:
+    if 'camera.points' in hub:
         try:
-            # Try to get the latest data without blocking
-            data = None
-            # Drain the queue and keep only the latest
-            while True:
-                try:
-                    data = queues['camera.points'].get_nowait()
-                except queue.Empty:
-                    break
-            
+            _, data = hub['camera.points'].latest()
             if data is not None:
-                # Put it back for the binary websocket
-                try:
-                    queues['camera.points'].put_nowait(data)
-                except queue.Full:
-                    pass
-                
                 return {
                     'num_points': int(data['num_points']),
                     'timestamp': str(data['timestamp']) if 'timestamp' in data.dtype.names else None
@@ -278,154 +1117,775 @@ async def get_pointcloud_status():
     
     return {'num_points': 0}
 
+@app.get("/api/pointcloud/status")
+async def get_pointcloud_status():
+    """Get current point cloud status."""
+    return pointcloud_status()
+
+class StateWatcher:
+    """Dashboard state polled once for every /ws client.
+
+    Each source is re-read on its own interval and serialized; the topic
+    publishes only when some serialized value differs from the last one, and
+    each connection sends only the keys that changed since its last send.
+    A source returning None has nothing yet and is retried every
+    STATE_RETRY seconds until it does.
+    """
+
+    def __init__(self, sources: Dict[str, tuple]):
+        self.sources = sources  # key -> (callable returning the state, poll interval in seconds)
+        self.state: Dict[str, bytes] = {}
+        self.topic = Topic('state')
+
+    def poll(self, key: str) -> bool:
+        read, _ = self.sources[key]
+        state = read()
+        if state is None:
+            return False
+        value = orjson.dumps(state, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        if value == self.state.get(key):
+            return False
+        # Replace rather than mutate so a connection's snapshot never changes under it
+        self.state = {**self.state, key: value}
+        return True
+
+    async def run(self) -> None:
+        self.topic.loop = asyncio.get_running_loop()
+        due = dict.fromkeys(self.sources, 0.0)
+        while True:
+            now = time.monotonic()
+            changed = False
+            for key, (_, interval) in self.sources.items():
+                if now < due[key]:
+                    continue
+                due[key] = now + interval
+                try:
+                    changed |= self.poll(key)
+                except Exception as e:
+                    print(f"Error reading {key} state: {e}")
+                if key not in self.state:
+                    due[key] = now + min(interval, STATE_RETRY)
+            if changed:
+                self.topic.publish(self.state)
+            await asyncio.sleep(max(0.0, min(due.values()) - time.monotonic()))
+
+state_watcher = StateWatcher({
+    'readers': (lambda: READERS, 60.0),
+    'writers': (lambda: discovery.writers, 1.0),
+    'daemons': (daemon_states, 1.0),
+    # The figures change on every sample, so keep the old poll rate
+    'system': (lambda: sampler.latest() if sampler.count else None, 5.0),
+    'pointcloud': (pointcloud_status, 1.0),
+})
+
+async def pace(next_frame: float, interval: float) -> float:
+    """Sleep until `interval` after the previous frame's slot; returns the new slot."""
+    if not interval:
+        return next_frame
+    next_frame = max(next_frame + interval, time.monotonic())
+    await asyncio.sleep(next_frame - time.monotonic())
+    return next_frame
+
+# JPEG downscale factors cv2 can apply while decoding (DCT scaling)
+JPEG_REDUCTIONS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+JPEG_QUALITY = 80
+
+def downscale_jpeg(jpeg, factor: int) -> bytes:
+    """Re-encode a JPEG (any buffer) at 1/factor size."""
+    img = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), JPEG_REDUCTIONS[factor])
+    if img is None:
+        raise ValueError("corrupt JPEG frame")
+    _, encoded = cv2.imencode('.jpg', img, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY])
+    return encoded.tobytes()
+
+class EncodedFrames:
+    """Per-frame encodings shared by all clients asking for the same variant.
+
+    Each variant key (e.g. a JPEG scale or a point cloud codec) keeps the
+    encoding of its latest frame; the encode runs once in an executor thread
+    and every client of that variant awaits the same result. A failed encode
+    raises in every client of that frame, which should skip it.
+    """
+
+    def __init__(self):
+        self.frames: Dict[tuple, tuple] = {}  # key -> (seq, future bytes)
+
+    async def get(self, key: tuple, seq: int, encode, *args) -> bytes:
+        entry = self.frames.get(key)
+        if entry is None or entry[0] < seq:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, encode, *args)
+            entry = self.frames[key] = (seq, future)
+        # Shield so one client disconnecting doesn't cancel the encode for the others
+        return await asyncio.shield(entry[1])
+
+encoded_frames = EncodedFrames()
+
 @app.get("/mjpeg/camera")
-async def mjpeg_stream():
-    """Stream MJPEG video from camera."""
+async def mjpeg_stream(fps: float = 0, scale: float = 1.0):
+    """Stream MJPEG video from camera.
+
+    `fps` caps this client's frame rate (0 = camera rate) and `scale` picks
+    the nearest of 1, 1/2, 1/4 or 1/8 size. A client that can't keep up
+    skips to the latest frame instead of building a backlog.
+    """
     headers = {"Content-Type": "multipart/x-mixed-replace; boundary=frame"}
+    factor = min((1, *JPEG_REDUCTIONS), key=lambda f: abs(1 / f - scale))
+    interval = 1.0 / fps if fps > 0 else 0.0
     async def generate():
-        while True:
-            try:
-                # Get the latest JPEG frame from the camera queue
-                if 'camera.jpeg' in queues:
+        topic = hub.subscribe('camera.jpeg')
+        cursor = 0
+        next_frame = time.monotonic()
+        try:
+            while True:
+                # Wait for the next JPEG frame from the camera
+                cursor, data = await topic.wait(cursor, paced=interval > 0)
+                # Access numpy structured array fields
+                size = int(data["bytesused"])
+                jpeg = memoryview(data["jpeg"])[:size]
+                if factor > 1:
+                    # Pass the view: only the one client that starts the encode reads it
                     try:
-                        data = queues['camera.jpeg'].get_nowait()
-                        # Access numpy structured array fields
-                        size = int(data["bytesused"])
-                        jpeg = memoryview(data["jpeg"])[:size]
-                        yield (b"--frame\r\n"
-                            b"Content-Type: image/jpeg\r\n"
-                            b"Content-Length: %d\r\n\r\n" % size + jpeg +
-                            b"\r\n")
-                    except queue.Empty:
-                        pass
-                
-                await asyncio.sleep(0.01)
-            except Exception as e:
-                print(f"Error in MJPEG stream: {e}")
-                break
+                        jpeg = await encoded_frames.get(('jpeg', factor), cursor, downscale_jpeg, jpeg, factor)
+                    except (ValueError, cv2.error):
+                        continue  # corrupt or torn frame, wait for the next
+                    size = len(jpeg)
+                frame = (b"--frame\r\n"
+                    b"Content-Type: image/jpeg\r\n"
+                    b"Content-Length: %d\r\n\r\n" % size + jpeg +
+                    b"\r\n")
+                if not topic.intact(cursor):
+                    continue
+                yield frame
+                next_frame = await pace(next_frame, interval)
+        except Exception as e:
+            print(f"Error in MJPEG stream: {e}")
+        finally:
+            hub.unsubscribe(topic)
     
     return StreamingResponse(generate(), 
                            headers=headers)
 
+Message = Union[str, bytes]
+
+async def send_message(websocket: WebSocket, message: Message) -> None:
+    if isinstance(message, bytes):
+        await websocket.send_bytes(message)
+    else:
+        await websocket.send_text(message)
+
+async def record_messages(topic: Topic, binary: bool = False, fps: float = 0) -> AsyncIterator[Message]:
+    """Messages for one writer, at most `fps` records per second (0 = writer rate).
+
+    Structured records are JSON text, or with `binary` a JSON schema message
+    followed by one binary frame per record (see BinaryEncoder).
+    """
+    writer_name = topic.name
+    # Skip JPEG data for camera.jpeg (use MJPEG stream instead)
+    skip_jpeg = (writer_name == 'camera.jpeg')
+    interval = 1.0 / fps if fps > 0 else 0.0
+    next_frame = time.monotonic()
+    cursor = 0
+    encoder = None
+    while True:
+        cursor, data = await topic.wait(cursor, paced=interval > 0)
+        if binary and getattr(data, 'dtype', None) is not None and data.dtype.names:
+            # (Re)send the schema whenever the writer's dtype changes
+            if encoder is None or encoder.source != data.dtype:
+                encoder = BinaryEncoder(data.dtype, skip_jpeg=skip_jpeg)
+                yield orjson.dumps({'writer': writer_name, 'schema': encoder.schema()}).decode()
+            message = encoder.encode(cursor, data)
+        elif getattr(data, 'dtype', None) is not None and data.dtype.names:
+            message = json_encoder(writer_name, data.dtype, skip_jpeg).encode(data)
+        else:
+            json_data = convert_numpy_to_json(data, skip_jpeg=skip_jpeg)
+            message = json.dumps({
+                'writer': writer_name,
+                'data': json_data,
+                'timestamp': str(json_data.get('timestamp', datetime.now().isoformat()))
+            })
+        if not topic.intact(cursor):
+            continue
+        yield message
+        next_frame = await pace(next_frame, interval)
+
 @app.websocket("/ws/writer/{writer_name}")
-async def writer_websocket(websocket: WebSocket, writer_name: str):
-    """WebSocket endpoint for streaming writer data."""
+async def writer_websocket(websocket: WebSocket, writer_name: str, format: str = 'json', fps: float = 0):
+    """WebSocket endpoint for streaming writer data (see record_messages)."""
     await websocket.accept()
     
-    if writer_name not in queues:
+    if not await topic_available(writer_name):
         await websocket.close()
         return
     
+    topic = hub.subscribe(writer_name)
     try:
-        while True:
-            # Get data from queue
-            try:
-                data = queues[writer_name].get_nowait()
-                # Skip JPEG data for camera.jpeg (use MJPEG stream instead)
-                skip_jpeg = (writer_name == 'camera.jpeg')
-                json_data = convert_numpy_to_json(data, skip_jpeg=skip_jpeg)
-                await websocket.send_json({
-                    'writer': writer_name,
-                    'data': json_data,
-                    'timestamp': str(json_data.get('timestamp', datetime.now().isoformat()))
-                })
-            except queue.Empty:
-                pass
-            
-            await asyncio.sleep(0.01)  # Small delay to prevent busy loop
-                
+        async for message in record_messages(topic, binary=(format == 'binary'), fps=fps):
+            await send_message(websocket, message)
     except WebSocketDisconnect:
         pass  # Normal disconnect
     except Exception as e:
         print(f"Error in WebSocket for {writer_name}: {e}")
+    finally:
+        hub.unsubscribe(topic)
+
+async def envelope_messages(topic: Topic, width: int = 540, window_ms: int = 1000,
+                            fps: float = 30) -> AsyncIterator[Message]:
+    """Waveform envelope of an audio writer instead of raw samples.
+
+    `width` buckets span `window_ms` of audio. After a JSON config message,
+    each binary frame is BINARY_HEADER followed by the new buckets as
+    interleaved int16 (min, max, rms), sent at most `fps` times per second.
+    """
+    sample_rate = AUDIO_SAMPLE_RATES[topic.name]
+    width = max(1, min(width, 4096))
+    samples_per_bucket = max(1, sample_rate * window_ms // 1000 // width)
+    reducer = EnvelopeReducer(samples_per_bucket)
+    interval = 1.0 / max(fps, 0.1)
+    cursor = 0
+    pending = []
+    last_send = 0.0
+    yield orjson.dumps({
+        'writer': topic.name,
+        'envelope': {
+            'width': width,
+            'window_ms': window_ms,
+            'sample_rate': sample_rate,
+            'samples_per_bucket': samples_per_bucket,
+            'header_size': BINARY_HEADER.size,
+        }
+    }).decode()
+    while True:
+        # Every record is reduced, only the sends are rate limited
+        cursor, data = await topic.wait(cursor)
+        pending.append(reducer.push(np.asarray(data['audio'])))
+        now = time.monotonic()
+        if now - last_send < interval:
+            continue
+        last_send = now
+        buckets = np.concatenate(pending)
+        pending.clear()
+        if len(buckets):
+            yield BINARY_HEADER.pack(cursor, time.time()) + buckets.tobytes()
+
+@app.websocket("/ws/envelope/{writer_name}")
+async def envelope_websocket(websocket: WebSocket, writer_name: str,
+                             width: int = 540, window_ms: int = 1000, fps: float = 30):
+    """Stream an audio writer as waveform envelope buckets (see envelope_messages)."""
+    await websocket.accept()
+    
+    if writer_name not in AUDIO_SAMPLE_RATES or not await topic_available(writer_name):
+        await websocket.close()
+        return
+    
+    topic = hub.subscribe(writer_name)
+    try:
+        async for message in envelope_messages(topic, width, window_ms, fps):
+            await send_message(websocket, message)
+    except WebSocketDisconnect:
+        pass  # Normal disconnect
+    except Exception as e:
+        print(f"Error in envelope WebSocket for {writer_name}: {e}")
+    finally:
+        hub.unsubscribe(topic)
+
+# Point cloud frames: header + payload, positions = origin + (q + 32768) * scale
+POINTS_MAGIC = b'BBPC'
+POINTS_HEADER = struct.Struct('<4sBBBxII3f3f')  # magic, codec, compression, has_colors, num_points, raw size, origin, scale
+POINTS_CODECS = {'float16': 0, 'int16': 1}
+POINTS_COMPRESSION = {'none': 0, 'zlib': 1, 'zstd': 2}
+COMPRESSION_LEVELS = {'zlib': range(-1, 10), 'zstd': range(1, 23)}
+
+def points_options_valid(codec: str, compression: str, level: int) -> bool:
+    """Whether a point cloud codec, compression and level can be encoded."""
+    return (codec in POINTS_CODECS and compression in POINTS_COMPRESSION
+            and level in COMPRESSION_LEVELS.get(compression, (level,)))
+
+_zstd_local = threading.local()  # ZstdCompressor isn't thread-safe, so each executor thread keeps its own
+
+def compress_payload(body: bytes, compression: str, level: int) -> bytes:
+    if compression == 'zlib':
+        return zlib.compress(body, level)
+    if compression == 'zstd':
+        compressors = getattr(_zstd_local, 'compressors', None)
+        if compressors is None:
+            compressors = _zstd_local.compressors = {}
+        compressor = compressors.get(level)
+        if compressor is None:
+            compressor = compressors[level] = zstandard.ZstdCompressor(level=level)
+        return compressor.compress(body)
+    return body
+
+def encode_points(points: np.ndarray, colors, codec: str = 'int16',
+                  compression: str = 'none', level: int = 1) -> bytes:
+    """Encode one point cloud frame behind a POINTS_HEADER.
+
+    `float16` sends the points as-is, interleaved xyz. `int16` quantizes each
+    axis to 16 bits over the frame's bounding box and sends planar x, y, z
+    deltas along scan order (wrapping int16), then planar r, g, b, so
+    neighbouring points compress well. The box covers finite points only;
+    points with a NaN or inf coordinate are sent at the box origin.
+    """
+    origin = np.zeros(3, dtype=np.float32)
+    scale = np.ones(3, dtype=np.float32)
+    if codec == 'int16':
+        pts = points.astype(np.float32)
+        finite = np.isfinite(pts).all(axis=1)
+        if finite.any():
+            origin = pts[finite].min(axis=0)
+            scale = (pts[finite].max(axis=0) - origin) / 65535
+            scale[scale == 0] = 1
+        if not finite.all():
+            pts = np.where(finite[:, None], pts, origin)
+        quantized = np.clip(np.rint((pts - origin) / scale), 0, 65535)
+        planar = (quantized - 32768).astype(np.int16).T.copy()
+        planar[:, 1:] = np.diff(planar, axis=1)
+        body = planar.tobytes() + (colors.T.tobytes() if colors is not None else b'')
+    else:
+        body = points.tobytes() + (colors.tobytes() if colors is not None else b'')
+    header = POINTS_HEADER.pack(
+        POINTS_MAGIC, POINTS_CODECS[codec], POINTS_COMPRESSION[compression],
+        colors is not None, len(points), len(body), *origin, *scale)
+    return header + compress_payload(body, compression, level)
+
+async def points_messages(topic: Topic, codec: str = None, compression: str = 'none',
+                          level: int = 1, fps: float = 0) -> AsyncIterator[bytes]:
+    """Point cloud frames, at most `fps` per second (0 = writer rate).
+
+    Without `codec` each frame is an int32 point count followed by float16
+    points and uint8 colors. With `codec` set to float16 or int16, frames use
+    encode_points, optionally compressed with zlib or zstd at `level`.
+    """
+    interval = 1.0 / fps if fps > 0 else 0.0
+    next_frame = time.monotonic()
+    cursor = 0
+    while True:
+        cursor, data = await topic.wait(cursor, paced=interval > 0)
+        try:
+            # Pack binary data efficiently
+            num_points = int(data['num_points'])
+            if num_points > 0 and num_points < 100000:  # Sanity check
+                colors = data['colors'][:num_points] if 'colors' in data.dtype.names else None
+                if codec is not None:
+                    frame = await encoded_frames.get(
+                        ('points', codec, compression, level), cursor,
+                        encode_points, data['points'][:num_points], colors, codec, compression, level)
+                else:
+                    # Create a binary message with header + points + colors
+                    # Header: 4 bytes (num_points as int32)
+                    header = np.array([num_points],dtype=np.int32).tobytes()
+                    # Points: num_points * 3 * 2 bytes (float16)
+                    points_data = data['points'][:num_points].tobytes()
+                    # Colors: num_points * 3 * 1 byte (uint8)
+                    colors_data = colors.tobytes() if colors is not None else b''
+                    frame = header + points_data + colors_data
+                if topic.intact(cursor):
+                    yield frame
+        except Exception as e:
+            print(f"Error encoding point cloud frame: {e}")
+        next_frame = await pace(next_frame, interval)
 
 @app.websocket("/ws/binary/camera.points")
-async def points_binary_websocket(websocket: WebSocket):
-    """Binary WebSocket endpoint for point cloud data."""
+async def points_binary_websocket(websocket: WebSocket, codec: str = None,
+                                  compression: str = 'none', level: int = 1, fps: float = 0):
+    """Binary WebSocket endpoint for point cloud data (see points_messages)."""
     print("Binary WebSocket connection attempt for camera.points")
     await websocket.accept()
     print("Binary WebSocket connection accepted for camera.points")
     
+    if codec is not None and not points_options_valid(codec, compression, level):
+        await websocket.close()
+        return
+    
+    topic = hub.subscribe('camera.points')
     try:
-        while True:
-            # Try to get data without blocking
-            data = None
-            try:
-                # Get latest data from main loop
-                if 'camera.points' in queues:
-                    data = queues['camera.points'].get_nowait()
-            except queue.Empty:
-                await asyncio.sleep(0.01)
-                continue
-            except Exception as e:
-                print(f"Error getting data from queue: {e}")
-                await asyncio.sleep(0.01)
-                continue
-                
-            if data is not None:
-                try:
-                    # Pack binary data efficiently
-                    num_points = int(data['num_points'])
-                    if num_points > 0 and num_points < 100000:  # Sanity check
-                        # Create a binary message with header + points + colors
-                        # Header: 4 bytes (num_points as int32)
-                        header = np.array([num_points],dtype=np.int32).tobytes()
-                        # Points: num_points * 3 * 2 bytes (float16)
-                        points_data = data['points'][:num_points].tobytes()
-                        # Colors: num_points * 3 * 1 byte (uint8)
-                        colors_data = data['colors'][:num_points].tobytes() if 'colors' in data.dtype.names else b''
-                        
-                        # Send as binary message
-                        await websocket.send_bytes(header + points_data + colors_data)
-                except Exception as e:
-                    print(f"Error sending binary data: {e}")
-                    
+        async for frame in points_messages(topic, codec, compression, level, fps):
+            # Send as binary message
+            await websocket.send_bytes(frame)
     except WebSocketDisconnect:
         print("Binary WebSocket disconnected")
     except Exception as e:
         print(f"Error in binary WebSocket for camera.points: {e}")
+    finally:
+        hub.unsubscribe(topic)
+
+# Binary frames on /ws are prefixed with the uint16 channel id the client subscribed with
+MUX_HEADER = struct.Struct('<H')
+
+def request_number(request: Dict[str, Any], key: str, default: float, low: float, high: float) -> float:
+    """`request[key]` if it's a number from `low` to `high`, else ValueError."""
+    value = request.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+        raise ValueError(f"{key} must be a number from {low} to {high}")
+    return value
+
+async def open_stream(request: Dict[str, Any]) -> tuple:
+    """Check a /ws subscribe request; returns (topic name, messages factory).
+
+    Raises ValueError with the reason for the client if the request can't
+    be streamed. The factory takes the subscribed Topic. Subscribing is left
+    to the stream task, so a task cancelled before it starts never holds
+    the topic.
+    """
+    name = request.get('topic')
+    kind = request.get('kind', 'record')
+    fps = request_number(request, 'fps', 0, 0, 1000)
+    if not isinstance(name, str) or not await topic_available(name):
+        raise ValueError(f"cannot stream {name}")
+    if kind == 'record':
+        make = lambda topic: record_messages(topic, binary=(request.get('format') == 'binary'), fps=fps)
+    elif kind == 'envelope' and name in AUDIO_SAMPLE_RATES:
+        width = int(request_number(request, 'width', 540, 1, 4096))
+        window_ms = int(request_number(request, 'window_ms', 1000, 1, 60000))
+        make = lambda topic: envelope_messages(topic, width, window_ms, fps or 30)
+    elif kind == 'points' and name == 'camera.points':
+        codec = request.get('codec', 'int16')
+        compression = request.get('compression', 'none')
+        level = int(request_number(request, 'level', 1, -1, 22))
+        if not points_options_valid(codec, compression, level):
+            raise ValueError(f"unsupported codec {codec}, compression {compression} or level {level}")
+        make = lambda topic: points_messages(topic, codec, compression, level, fps)
+    else:
+        raise ValueError(f"cannot stream {name} as {kind}")
+    return name, make
+
+@app.websocket("/ws")
+async def multiplexed_websocket(websocket: WebSocket):
+    """One connection carrying any number of streams plus the dashboard state.
+
+    The client sends JSON text requests:
+      {"op": "subscribe", "id": n, "topic": name, "kind": "record"|"envelope"|"points", "fps": ..., ...}
+      {"op": "unsubscribe", "id": n}
+    where `id` is a client-chosen uint16 channel and the remaining fields are
+    the options of the matching per-topic endpoint. A stream's binary frames
+    arrive as MUX_HEADER + frame and its text messages as
+    {"channel": n, "message": ...}; a rejected subscribe gets
+    {"channel": n, "error": ...}. Dashboard state (readers, writers, daemons,
+    system, pointcloud) is pushed as {"state": key, "value": ...} on connect
+    and then only when it changes.
+    """
+    await websocket.accept()
+    send_lock = asyncio.Lock()
+    streams: Dict[int, asyncio.Task] = {}
+    
+    async def send(message: Message) -> None:
+        async with send_lock:
+            await send_message(websocket, message)
+    
+    async def forward(channel: int, name: str, make) -> None:
+        prefix = MUX_HEADER.pack(channel)
+        topic = hub.subscribe(name)
+        try:
+            async for message in make(topic):
+                if isinstance(message, bytes):
+                    await send(prefix + message)
+                else:
+                    await send('{"channel":%d,"message":%s}' % (channel, message))
+        except WebSocketDisconnect:
+            pass  # The receive loop sees the disconnect and cancels the rest
+        except Exception as e:
+            print(f"Error in /ws stream {topic.name}: {e}")
+        finally:
+            hub.unsubscribe(topic)
+    
+    async def push_state() -> None:
+        cursor = 0
+        sent: Dict[str, bytes] = {}
+        while True:
+            cursor, state = await state_watcher.topic.wait(cursor)
+            for key, value in state.items():
+                # Unchanged values keep the same bytes object across snapshots
+                if sent.get(key) is not value:
+                    sent[key] = value
+                    await send('{"state":"%s","value":%s}' % (key, value.decode()))
+    
+    tasks = [asyncio.create_task(push_state())]
+    try:
+        while True:
+            text = await websocket.receive_text()
+            channel = None
+            # A bad request only gets an error reply, the other streams carry on
+            try:
+                request = json.loads(text)
+                if not isinstance(request, dict):
+                    raise ValueError('requests must be JSON objects')
+                channel = request.get('id')
+                if request.get('op') == 'unsubscribe':
+                    task = streams.pop(channel, None) if isinstance(channel, int) else None
+                    if task is not None:
+                        task.cancel()
+                elif request.get('op') == 'subscribe':
+                    if (isinstance(channel, bool) or not isinstance(channel, int)
+                            or not 0 <= channel <= 0xFFFF or channel in streams):
+                        raise ValueError('invalid or duplicate channel id')
+                    stream = await open_stream(request)
+                    streams[channel] = asyncio.create_task(forward(channel, *stream))
+            except ValueError as e:
+                await send(json.dumps({'channel': channel, 'error': str(e)}))
+    except WebSocketDisconnect:
+        pass  # Normal disconnect
+    except Exception as e:
+        print(f"Error in multiplexed WebSocket: {e}")
+    finally:
+        for task in [*tasks, *streams.values()]:
+            task.cancel()
+
+def read_loop(hub: Hub, open_reader=Reader) -> None:
+    """Keep a Reader open for every subscribed topic and publish its records.
+
+    Readers are opened when a topic gets its first subscriber and closed
+    READER_LINGER seconds after its last one leaves. With nothing
+    subscribed the loop blocks on `hub.changed` instead of spinning, and a
+    pass in which no reader was ready waits READER_POLL before the next.
+    """
+    readers = {}  # name -> (Reader, Topic)
+    retry_at = {}  # name -> time of the next open attempt
+    next_sync = 0.0
+    try:
+        while True:
+            now = time.monotonic()
+            if hub.changed.is_set() or now >= next_sync:
+                hub.changed.clear()
+                next_sync = now + 0.5
+                for topic in hub.snapshot():
+                    name = topic.name
+                    if topic.subscribers and name not in readers:
+                        if retry_at.get(name, 0.0) > now:
+                            continue
+                        try:
+                            reader = open_reader(name)
+                            reader.__enter__()
+                            readers[name] = (reader, topic)
+                            retry_at.pop(name, None)
+                            print(f"Opened reader for {name}")
+                        except Exception as e:
+                            print(f"Error opening reader for {name}: {e}")
+                            retry_at[name] = now + READER_RETRY
+                    elif not topic.subscribers:
+                        retry_at.pop(name, None)
+                        if name in readers and now - topic.idle_since > READER_LINGER:
+                            readers.pop(name)[0].__exit__(None, None, None)
+                            topic.clear()
+                            print(f"Closed reader for {name}")
+            if not readers:
+                # Idle: sleep until a client subscribes (or a failed open is due a retry)
+                hub.changed.wait(READER_RETRY if retry_at else None)
+                continue
+            ready = False
+            for reader, topic in readers.values():
+                if reader.ready():
+                    topic.publish(reader.data)
+                    ready = True
+            if not ready:
+                # Nothing new: back off instead of spinning on ready() (a new subscription still wakes us)
+                hub.changed.wait(READER_POLL)
+    finally:
+        for reader, _ in readers.values():
+            reader.__exit__(None, None, None)
+
+class SharedRing:
+    """The latest records of one topic in shared memory, for split mode.
+
+    Layout: a uint64 count of records written, then SHARED_SLOTS slots of
+    (uint64 seq, record). The reader process writes; the HTTP process maps
+    the same memory, so records are never pickled between the two. Records
+    up to SHARED_COPY bytes are copied out; larger ones are published as
+    views of the slots, valid until the ring wraps SHARED_SLOTS - 1 records
+    later (see intact).
+    """
+
+    def __init__(self, dtype: np.dtype, slots: int = SHARED_SLOTS, name: str = None):
+        self.dtype = dtype
+        slot_dtype = np.dtype([('seq', '<u8'), ('record', dtype)])
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=8 + slots * slot_dtype.itemsize)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.count = np.ndarray((), '<u8', buffer=self.shm.buf)
+        self.slots = np.ndarray(slots, slot_dtype, buffer=self.shm.buf, offset=8)
+
+    def write(self, data) -> None:
+        seq = int(self.count) + 1
+        slot = self.slots[seq % len(self.slots)]
+        slot['seq'] = 0  # torn while the record is copied in
+        slot['record'] = data
+        slot['seq'] = seq
+        self.count[()] = seq
+
+    def read(self, seq: int):
+        """Record `seq` (a copy or a view, see above), or None once it has been overwritten."""
+        slot = self.slots[seq % len(self.slots)]
+        if int(slot['seq']) != seq:
+            return None
+        record = slot['record']
+        if self.dtype.itemsize <= SHARED_COPY:
+            record = record.copy()
+            # The writer may have lapped us during the copy
+            if int(slot['seq']) != seq:
+                return None
+        return record
+
+    def intact(self, seq: int) -> bool:
+        """Whether the slot still holds record `seq`."""
+        return int(self.slots[seq % len(self.slots)]['seq']) == seq
+
+    def close(self, unlink: bool = False) -> None:
+        # Drop our views first, the mapping can't close while they exist
+        del self.count, self.slots
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def reader_process(conn, open_reader=Reader) -> None:
+    """Split mode reader: run read_loop in its own process.
+
+    `conn` receives the list of topics the HTTP process wants. Records are
+    written into one SharedRing per topic and each new ring is announced
+    back over `conn` as (name, shared memory name, dtype).
+    """
+    hub = Hub()
+    rings: Dict[str, SharedRing] = {}
+    
+    def ring_writer(name: str):
+        def write(data) -> None:
+            ring = rings.get(name)
+            if ring is None or ring.dtype != data.dtype:
+                ring = rings[name] = SharedRing(data.dtype)
+                conn.send((name, ring.shm.name, ring.dtype))
+            ring.write(data)
+        return write
+    
+    def control() -> None:
+        wanted: Dict[str, Topic] = {}
+        try:
+            while True:
+                names = set(conn.recv())
+                for name in names - wanted.keys():
+                    topic = wanted[name] = hub.subscribe(name)
+                    if not topic.sinks:
+                        topic.sinks.append(ring_writer(name))
+                for name in wanted.keys() - names:
+                    hub.unsubscribe(wanted.pop(name))
+        except EOFError:
+            # The HTTP process is gone; stop read_loop so the rings get unlinked
+            _thread.interrupt_main()
+    
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    threading.Thread(target=control, daemon=True).start()
+    try:
+        read_loop(hub, open_reader)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for ring in rings.values():
+            ring.close(unlink=True)
 
-def ui(port: int, q: Dict[str, queue.Queue]):
+def shared_read_loop(hub: Hub, conn) -> None:
+    """Split mode counterpart of read_loop in the HTTP process.
+
+    Forwards the subscribed topics to reader_process and publishes every
+    record still in each topic's ring, in order, so sinks see them all.
+    """
+    wanted = set()
+    rings = {}  # name -> [SharedRing, last published seq]
+    retired = []
+    while True:
+        if hub.changed.is_set():
+            hub.changed.clear()
+            names = {topic.name for topic in hub.snapshot() if topic.subscribers}
+            if names != wanted:
+                wanted = names
+                conn.send(sorted(names))
+        while conn.poll():
+            name, shm_name, dtype = conn.recv()
+            if name in rings:
+                # The writer's dtype changed; subscribers may still hold views of the old ring
+                retired.append(rings[name][0])
+            rings[name] = [SharedRing(dtype, name=shm_name), 0]
+        for name, entry in rings.items():
+            ring, seq = entry
+            count = int(ring.count)
+            if count == seq:
+                continue
+            topic = hub[name]
+            for s in range(max(seq + 1, count - len(ring.slots) + 1), count + 1):
+                data = ring.read(s)
+                if data is not None:
+                    copied = ring.dtype.itemsize <= SHARED_COPY
+                    topic.publish(data, None if copied else functools.partial(ring.intact, s))
+            entry[1] = count
+        if not wanted:
+            # Idle: sleep until a client subscribes
+            hub.changed.wait()
+            continue
+        time.sleep(SHARED_POLL)
+
+def ui(port: int, h: Hub):
     """Run the FastAPI application in a separate thread."""
-    global queues
-    queues = q
+    global hub
+    hub = h
     uvicorn.run(app, host='0.0.0.0', port=port)
 
 def main() -> None:
-    """Entry point to run the Flow Dashboard server."""
+    """Entry point to run the Flow Dashboard server.
+
+    Set FLOW_SPLIT=1 to read in a separate process (see reader_process) so
+    readers and the web server don't compete for one GIL, and
+    FLOW_HISTORY=0 to record the HISTORY_BUDGETS topics only while a
+    client is subscribed, so their readers can close when idle.
+    """
     port = int(os.environ.get('FLOW_PORT', '8002'))
+    split = os.environ.get('FLOW_SPLIT', '0') not in ('', '0')
+    record_history = os.environ.get('FLOW_HISTORY', '1') not in ('', '0')
+    run(port, split, record_history=record_history)
+
+def run(port: int, split: bool = False, open_reader=Reader, record_history: bool = True) -> None:
+    if open_reader is None:
+        raise RuntimeError("bbos is not installed; pass open_reader, e.g. sim.SimReader")
+    # One latest-value slot per subscribed topic, shared by all subscribers
+    hub = Hub()
+    
+    # Audio is always recorded so clients can fetch the last few seconds
+    for name, ring in audio_rings.items():
+        hub.subscribe(name).sinks.append(ring.write)
+    # History topics too, unless record_history is off: then only while something reads them
+    for name, history in histories.items():
+        topic = hub.subscribe(name) if record_history else hub.topic(name)
+        topic.sinks.append(history.write)
     
-    # Create queues with appropriate sizes
-    queues = {r: queue.Queue(maxsize=5 if r == 'camera.points' else 3) for r in READERS}
-    readers = {r: Reader(r) for r in READERS}
+    if split:
+        # Fork the reader before any thread exists. Both processes share one
+        # resource tracker, so the reader unlinking a ring also clears the
+        # registration this process makes when it attaches to it.
+        resource_tracker.ensure_running()
+        conn, child_conn = multiprocessing.Pipe()
+        reader = multiprocessing.Process(target=reader_process, args=(child_conn, open_reader), daemon=True)
+        reader.start()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     
     # Start UI thread
-    ui_thread = threading.Thread(target=ui, args=(port, queues))
+    ui_thread = threading.Thread(target=ui, args=(port, hub))
     ui_thread.daemon = True
     ui_thread.start()
     
+    print(f"Flow Dashboard running on http://0.0.0.0:{port}" + (" (split reader process)" if split else ""))
+    
     # Main reader loop
-    with ExitStack() as stack:
-        for reader in readers.values():
-            stack.enter_context(reader)
-            
-        print(f"Flow Dashboard running on http://0.0.0.0:{port}")
-        
-        try:
-            while True:
-                for r in READERS:
-                    if readers[r].ready():
-                        try:
-                            data = readers[r].data
-                            queues[r].put_nowait(data)
-                        except queue.Full:
-                            try:
-                                queues[r].get_nowait()
-                            except queue.Empty:
-                                pass
-                            queues[r].put_nowait(data)
-        except KeyboardInterrupt:
-            print("\nShutting down...")
+    try:
+        if split:
+            shared_read_loop(hub, conn)
+        else:
+            read_loop(hub, open_reader)
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        if split:
+            reader.terminate()
+            reader.join()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
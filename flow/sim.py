@@ -0,0 +1,175 @@
+"""Synthetic bbos records for exercising flow without the robot."""
+
+import struct
+import time
+import cv2
+import numpy as np
+
+MIC_RATE = 16000
+MIC_CHUNK = 1600  # 100 ms at MIC_RATE
+MAX_POINTS = 100000
+DEPTH_SHAPE = (240, 320)  # rows, cols of the synthetic depth image
+FRAME_SHAPE = (480, 640)  # rows, cols of the synthetic camera image
+JPEG_MAX = 256 * 1024
+# Synthetic JPEGs carry their due time in a COM segment right after SOI,
+# so clients of the MJPEG stream can measure latency
+JPEG_STAMP = struct.Struct('>2sH20s')  # marker, length, epoch seconds as ASCII
+
+DTYPES = {
+    'camera.jpeg': np.dtype([
+        ('timestamp', 'datetime64[ns]'),
+        ('bytesused', '<u4'),
+        ('jpeg', 'u1', (JPEG_MAX,)),
+    ]),
+    'transcript': np.dtype([
+        ('timestamp', 'datetime64[ns]'),
+        ('text', 'S256'),
+    ]),
+    'drive.state': np.dtype([
+        ('timestamp', 'datetime64[ns]'),
+        ('pos', '<f4', (2,)),
+        ('vel', '<f4', (2,)),
+        ('torque', '<f4', (2,)),
+    ]),
+    'speakerphone.mic': np.dtype([
+        ('timestamp', 'datetime64[ns]'),
+        ('audio', '<i2', (MIC_CHUNK, 1)),
+    ]),
+    'camera.points': np.dtype([
+        ('timestamp', 'datetime64[ns]'),
+        ('num_points', '<i4'),
+        ('points', '<f2', (MAX_POINTS, 3)),
+        ('colors', 'u1', (MAX_POINTS, 3)),
+    ]),
+}
+
+# Records per second SimReader produces for each writer
+RATES = {
+    'camera.jpeg': 30.0,
+    'transcript': 0.5,
+    'drive.state': 50.0,
+    'speakerphone.mic': 10.0,
+    'camera.points': 10.0,
+}
+
+PHRASES = [
+    b"hey bracketbot",
+    b"drive forward two meters",
+    b"what can you see right now",
+    b"turn the lights blue",
+]
+
+def make_record(name: str, rng: np.random.Generator):
+    """Build one record for `name` shaped like what the bbos Reader returns."""
+    record = np.zeros((), dtype=DTYPES[name])
+    record['timestamp'] = np.datetime64('now', 'ns')
+    if name == 'camera.jpeg':
+        jpeg = camera_jpeg(rng)
+        record['bytesused'] = len(jpeg)
+        record['jpeg'][:len(jpeg)] = np.frombuffer(jpeg, dtype=np.uint8)
+    elif name == 'transcript':
+        record['text'] = PHRASES[rng.integers(len(PHRASES))]
+    elif name == 'drive.state':
+        record['pos'] = rng.normal(size=2)
+        record['vel'] = rng.normal(scale=0.2, size=2)
+        record['torque'] = rng.normal(scale=0.5, size=2)
+    elif name == 'speakerphone.mic':
+        t = np.arange(MIC_CHUNK) / MIC_RATE
+        tone = 3000 * np.sin(2 * np.pi * 440 * t) + rng.normal(scale=300, size=MIC_CHUNK)
+        record['audio'] = tone.astype(np.int16).reshape(-1, 1)
+    elif name == 'camera.points':
+        points, colors = depth_cloud(rng)
+        record['num_points'] = len(points)
+        record['points'][:len(points)] = points
+        record['colors'][:len(points)] = colors
+    return record[()]
+
+def camera_jpeg(rng: np.random.Generator) -> bytes:
+    """A noisy gradient frame as a JPEG with a blank JPEG_STAMP segment."""
+    rows, cols = FRAME_SHAPE
+    v, u = np.mgrid[0:rows, 0:cols]
+    img = np.stack((u * 255 // cols, v * 255 // rows, np.full(u.shape, 128)), axis=-1)
+    img = (img + rng.normal(scale=12, size=img.shape)).clip(0, 255).astype(np.uint8)
+    _, encoded = cv2.imencode('.jpg', img, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
+    jpeg = encoded.tobytes()
+    stamp = JPEG_STAMP.pack(b'\xff\xfe', JPEG_STAMP.size - 2, b'')
+    return jpeg[:2] + stamp + jpeg[2:]
+
+def stamp_jpeg(record, t: float) -> None:
+    """Write `t` into the JPEG_STAMP segment of a camera.jpeg record."""
+    text = b'%.6f' % t
+    record['jpeg'][6:6 + len(text)] = np.frombuffer(text, dtype=np.uint8)
+
+def jpeg_time(jpeg: bytes):
+    """The time stamp_jpeg wrote into a JPEG, or None if it has none."""
+    if jpeg[2:4] != b'\xff\xfe':
+        return None
+    text = JPEG_STAMP.unpack_from(jpeg, 2)[2].rstrip(b'\0')
+    return float(text) if text else None
+
+def depth_cloud(rng: np.random.Generator):
+    """A floor and a back wall seen by a forward-facing depth camera, in scan order."""
+    rows, cols = DEPTH_SHAPE
+    v, u = np.mgrid[0:rows, 0:cols].astype(np.float32)
+    # Normalized image coordinates for a ~90 degree horizontal field of view
+    x_img = (u - cols / 2) / (cols / 2)
+    y_img = (v - rows / 2) / (cols / 2)
+    # Floor 0.3 m below the camera, wall at 3 m
+    depth = np.where(y_img > 0.1, 0.3 / np.maximum(y_img, 0.1), 3.0)
+    depth = np.minimum(depth, 3.0) + rng.normal(scale=0.005, size=depth.shape)
+    points = np.stack((depth, -x_img * depth, -y_img * depth), axis=-1).reshape(-1, 3)
+    colors = np.stack((
+        np.where(y_img > 0.1, 90, 200) + 20 * np.sin(u / 8),
+        np.where(y_img > 0.1, 70, 190) + 20 * np.cos(v / 8),
+        np.full(u.shape, 60.0),
+    ), axis=-1).reshape(-1, 3)
+    return points.astype(np.float16), colors.clip(0, 255).astype(np.uint8)
+
+class Config:
+    """Stand-in for bbos.Config with the audio formats of the sim writers."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.mic_sample_rate = MIC_RATE
+        self.mic_channels = 1
+        self.speaker_sample_rate = MIC_RATE
+        self.speaker_channels = 1
+
+class SimReader:
+    """Stand-in for bbos.Reader producing make_record() records at `rates`.
+
+    A few records are built up front and cycled. Each is stamped with the
+    time it was due rather than the time it was polled, so a reader loop
+    that polls late shows up as record age. Writers without a rate never
+    get data.
+    """
+
+    POOL = 4
+
+    def __init__(self, name: str, seed: int = 0, rates: dict = RATES):
+        self.name = name
+        self.period = 1.0 / rates[name] if rates.get(name) else None
+        rng = np.random.default_rng(seed)
+        self.pool = [make_record(name, rng) for _ in range(self.POOL)] if self.period else []
+        self.count = 0
+        self.due = time.time()
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def ready(self) -> bool:
+        now = time.time()
+        if self.period is None or now < self.due:
+            return False
+        self.data = self.pool[self.count % self.POOL]
+        self.data['timestamp'] = np.datetime64(int(self.due * 1e9), 'ns')
+        if self.name == 'camera.jpeg':
+            stamp_jpeg(self.data, self.due)
+        self.count += 1
+        # Drop periods we were too late for instead of bursting to catch up
+        self.due = max(self.due + self.period, now - self.period)
+        return True
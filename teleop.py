@@ -6,25 +6,54 @@
 #   "wsproto",
 #   "opencv-python",
 #   "numpy",
+#   "aiortc",
+#   "av",
 # ]
 # [tool.uv.sources]
 # bbos = { path = "/home/bracketbot/BracketBotOS", editable = true }
 # ///
 import asyncio
 import json
+import os
 import signal
+import struct
+import time
 import numpy as np
 import cv2
 import threading
-import queue
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, StreamingResponse
+from collections import deque
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 import uvicorn
+from aiortc import RTCConfiguration, RTCPeerConnection, RTCSessionDescription, VideoStreamTrack
+from aiortc.mediastreams import MediaStreamError, VIDEO_CLOCK_RATE, VIDEO_TIME_BASE
+from av import VideoFrame
 
 from bbos import Reader, Writer, Type
 
 SPEED_LIN = 0.15  # m s⁻¹  forward/back
 SPEED_ANG = 0.3 # rad s⁻¹ CCW+
+CONTROL_HZ = 100  # drive.ctrl writes per second
+LATENCY_WINDOW = 1000  # commands kept for the latency percentiles
+# Cores for the JPEG encoder, e.g. TELEOP_ENCODE_CPUS=2,3 keeps it off the control thread's core
+ENCODE_CPUS = os.environ.get('TELEOP_ENCODE_CPUS')
+# /feed quality levels as (JPEG quality, scale), best first; clients on the same level share an encode
+FEED_LEVELS = [(85, 1.0), (75, 1.0), (65, 0.75), (55, 0.5), (45, 0.5), (35, 0.25)]
+FEED_TARGET_LATENCY = 0.1  # s a frame may take to drain to the client before its level drops
+FEED_UPGRADE_AFTER = 30  # frames in a row well under the target before trying a better level
+FEED_DRAIN_POLL = 0.005  # s between send queue checks
+WEBRTC_WIDTH = 640  # px width of the WebRTC video track; frames are encoded in software
+# Stop the robot when a client that was driving it goes silent this long (s), e.g. TELEOP_DEADMAN=0.3
+DEADMAN_TIMEOUT = float(os.environ.get('TELEOP_DEADMAN', 0.5))
+
+# Binary joystick frames on /ws and the WebRTC data channel, little-endian. Client times
+# are the client's own clock in ms and are only echoed back, for round-trip latency.
+FRAME_COMMAND = 1  # client -> server: type, seq, client time, x, y
+FRAME_PING = 2  # client -> server, echoed back unchanged
+FRAME_ACK = 3  # server -> client: type, seq, client time of a command once written to drive.ctrl
+COMMAND_FRAME = struct.Struct('<BIdff')
+PING_FRAME = struct.Struct('<BId')  # also the layout of FRAME_ACK
 
 _stop = False
 
@@ -34,44 +63,272 @@ def _sigint(*_):
 
 signal.signal(signal.SIGINT, _sigint)
 
-# Global queues
-jpeg_queue = queue.Queue(maxsize=3)
-cmd_queue = queue.Queue(maxsize=3)
-
-def reader_loop():
-    with Reader('camera.rect') as r_rect, \
-         Writer('drive.ctrl', Type("drive_ctrl")) as w_ctrl:
+class FeedHub:
+    """Latest camera frame at each of `levels` levels, shared by the clients of a level.
+
+    For /feed a level is a FEED_LEVELS JPEG setting. Clients that have sent
+    the latest frame of their level count as waiting; the reader only
+    encodes the levels someone waits for, so with no /feed open nothing is
+    encoded and frames are encoded no faster than the fastest client of a
+    level takes them. Frames are numbered by camera frame, so a client
+    changing level never goes back in time.
+    """
+
+    def __init__(self, levels):
+        self.lock = threading.Lock()
+        self.frames = [(None, 0)] * levels  # level -> (frame, camera frame number)
+        self.waiting = [0] * levels
+
+    def wanted(self):
+        return [level for level, n in enumerate(self.waiting) if n > 0]
+
+    def publish(self, level, jpeg, seq):
+        with self.lock:
+            self.frames[level] = (jpeg, seq)
+
+    async def next(self, level, seen):
+        """Wait for a frame at `level` newer than `seen`; returns (frame, seq)."""
+        with self.lock:
+            self.waiting[level] += 1
+        try:
+            while self.frames[level][1] <= seen and not _stop:
+                await asyncio.sleep(0.005)
+        finally:
+            with self.lock:
+                self.waiting[level] -= 1
+        with self.lock:
+            return self.frames[level]
+
+def send_queue(local_port, remote_port, paths=('/proc/net/tcp', '/proc/net/tcp6')):
+    """Bytes a TCP connection has sent or buffered but not had acknowledged (tx_queue in /proc/net)."""
+    for path in paths:
+        try:
+            with open(path) as f:
+                next(f)  # header
+                for line in f:
+                    fields = line.split()
+                    if (int(fields[1].rsplit(':', 1)[1], 16) == local_port
+                            and int(fields[2].rsplit(':', 1)[1], 16) == remote_port):
+                        return int(fields[4].split(':')[0], 16)
+        except OSError:
+            continue
+    return None
+
+class FeedClient:
+    """Quality level of one /feed client, adapted to how fast its link drains.
+
+    After each frame the stream waits until the connection's send queue
+    holds less than that frame, so at most about one frame is ever queued
+    for a slow link. If a frame takes longer than FEED_TARGET_LATENCY to
+    get there the client drops a level; after FEED_UPGRADE_AFTER frames in
+    a row that took under a third of it, it tries the next better level.
+    """
+
+    def __init__(self, ports):
+        self.ports = ports  # (server port, client port) of the connection
+        self.level = 0
+        self.quick = 0
+        self.latency = 0.0  # s, smoothed
+        self.interval = 0.0  # s between frames, smoothed
+        self.last_sent = None
+
+    async def drain(self, size):
+        """Wait until less than `size` bytes are queued for the client."""
+        while not _stop:
+            queued = send_queue(*self.ports)
+            if queued is None or queued < size:
+                return
+            await asyncio.sleep(FEED_DRAIN_POLL)
+
+    def sent(self, started):
+        """Adapt the level to a frame that took from `started` until now to drain."""
+        now = time.monotonic()
+        latency = now - started
+        self.latency += 0.2 * (latency - self.latency)
+        if self.last_sent is not None:
+            self.interval += 0.2 * (now - self.last_sent - self.interval)
+        self.last_sent = now
+        if latency > FEED_TARGET_LATENCY:
+            self.level = min(self.level + 1, len(FEED_LEVELS) - 1)
+            self.quick = 0
+        elif latency < FEED_TARGET_LATENCY / 3:
+            self.quick += 1
+            if self.quick >= FEED_UPGRADE_AFTER and self.level > 0:
+                self.level -= 1
+                self.quick = 0
+        else:
+            self.quick = 0
+
+    def settings(self):
+        quality, scale = FEED_LEVELS[self.level]
+        fps = 1.0 / self.interval if self.interval else 0.0
+        return {'quality': quality, 'scale': scale, 'fps': round(fps, 1),
+                'latency_ms': round(self.latency * 1e3, 1)}
+
+class CommandSlot:
+    """Latest joystick command; the control loop only ever acts on the newest.
+
+    Also keeps when a client was last heard from, for the deadman watchdog,
+    and how long recent commands took from arriving to being written to
+    drive.ctrl.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cmd = None  # (x, y, monotonic time received, ack callback or None)
+        self.arrived = threading.Event()
+        self.heard_at = time.monotonic()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # seconds
+
+    def put(self, x, y, ack=None):
+        """Queue a command; `ack` is called from the control thread once it's written."""
+        with self.lock:
+            self.cmd = (x, y, time.monotonic(), ack)
+            self.heard_at = self.cmd[2]
+            self.arrived.set()
+
+    def heard(self):
+        """A client is still there (e.g. it sent a ping)."""
+        self.heard_at = time.monotonic()
+
+    def take(self):
+        with self.lock:
+            cmd, self.cmd = self.cmd, None
+            self.arrived.clear()
+            return cmd
+
+    def percentiles(self):
+        latencies = np.array(self.latencies) * 1e3
+        if not len(latencies):
+            return {'commands': 0}
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        return {'commands': len(latencies), 'p50_ms': round(p50, 3), 'p90_ms': round(p90, 3),
+                'p99_ms': round(p99, 3), 'max_ms': round(latencies.max(), 3)}
+
+class CameraTrack(VideoStreamTrack):
+    """camera.rect as a WebRTC video track, WEBRTC_WIDTH wide.
+
+    Frames come from video_hub, so the camera is only read while a peer
+    is receiving; the peer connection does the encoding and congestion
+    control.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.seen = 0
+        self.start = None
+
+    async def recv(self):
+        img, self.seen = await video_hub.next(0, self.seen)
+        if img is None or self.readyState != "live":
+            raise MediaStreamError
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        frame = VideoFrame.from_ndarray(img, format="bgr24")
+        frame.pts = int((now - self.start) * VIDEO_CLOCK_RATE)
+        frame.time_base = VIDEO_TIME_BASE
+        return frame
+
+feed_hub = FeedHub(len(FEED_LEVELS))
+video_hub = FeedHub(1)  # raw frames for WebRTC tracks
+feed_clients = {}  # /feed id -> FeedClient
+commands = CommandSlot()
+
+def control_loop():
+    """Write the latest joystick command to drive.ctrl at CONTROL_HZ.
+
+    A new command wakes the loop early, so it's written without waiting
+    for the next tick. While the robot is moving, nothing heard from any
+    client for DEADMAN_TIMEOUT zeroes the twist.
+    """
+    period = 1.0 / CONTROL_HZ
+    next_tick = time.monotonic()
+    moving = False
+    with Writer('drive.ctrl', Type("drive_ctrl")) as w_ctrl:
         while not _stop:
-            # Handle camera data
-            if r_rect.ready():
-                img = r_rect.data['rect']
-                # Encode as JPEG
+            cmd = commands.take()
+            silence = time.monotonic() - commands.heard_at
+            if cmd is None and moving and silence > DEADMAN_TIMEOUT:
+                print(f"[teleop] No commands for {silence:.2f} s, stopping")
+                cmd = (0, 0, None, None)
+            with w_ctrl.buf() as buf:
+                if cmd is not None:
+                    x, y, _, _ = cmd
+                    buf["twist"] = np.array([y * SPEED_LIN, x * SPEED_ANG], dtype=np.float32)
+            if cmd is not None:
+                x, y, received, ack = cmd
+                moving = x != 0 or y != 0
+                if received is not None:
+                    commands.latencies.append(time.monotonic() - received)
+                if ack is not None:
+                    ack()
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay <= 0:
+                next_tick = time.monotonic()  # fell behind; don't try to catch up
+            elif commands.arrived.wait(delay):
+                next_tick = time.monotonic()
+
+def encode_loop():
+    """Encode camera.rect frames at the levels /feed clients wait for, off the control path."""
+    if ENCODE_CPUS:
+        os.sched_setaffinity(0, {int(cpu) for cpu in ENCODE_CPUS.split(',')})  # this thread only
+    seq = 0
+    with Reader('camera.rect') as r_rect:
+        while not _stop:
+            levels = feed_hub.wanted()
+            video = video_hub.wanted()
+            if not levels and not video:
+                time.sleep(0.01)
+                continue
+            if not r_rect.ready():
+                time.sleep(0.001)
+                continue
+            img = r_rect.data['rect']
+            seq += 1
+            if video:
+                height = round(img.shape[0] * WEBRTC_WIDTH / img.shape[1] / 2) * 2
+                video_hub.publish(0, cv2.resize(img, (WEBRTC_WIDTH, height), interpolation=cv2.INTER_AREA), seq)
+            for level in levels:
+                quality, scale = FEED_LEVELS[level]
+                scaled = img if scale == 1.0 else cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
                 encode_param = [
-                    int(cv2.IMWRITE_JPEG_QUALITY), 85,
+                    int(cv2.IMWRITE_JPEG_QUALITY), quality,
                     int(cv2.IMWRITE_JPEG_PROGRESSIVE), 0,
                     int(cv2.IMWRITE_JPEG_OPTIMIZE), 0
                 ]
-                _, encoded = cv2.imencode('.jpg', img, encode_param)
-                
-                try:
-                    jpeg_queue.put_nowait(encoded.tobytes())
-                except:
-                    try:
-                        jpeg_queue.get_nowait()
-                        jpeg_queue.put_nowait(encoded.tobytes())
-                    except:
-                        pass
-            # Handle drive commands
-            with w_ctrl.buf() as buf:
-              try:
-                  cmd = cmd_queue.get_nowait()
-                  twist = np.array([cmd['y'] * SPEED_LIN, cmd['x'] * SPEED_ANG], dtype=np.float32)
-                  buf["twist"] = twist
-              except queue.Empty:
-                  pass
+                _, encoded = cv2.imencode('.jpg', scaled, encode_param)
+                feed_hub.publish(level, encoded.tobytes(), seq)
+
+def joystick_command(message, reply):
+    """Handle a joystick message from /ws or the WebRTC data channel.
+
+    Binary frames are commands and pings (see COMMAND_FRAME); JSON {x, y}
+    text is still accepted. `reply(bytes)` sends back to the client and
+    must be safe to call from the control thread.
+    """
+    if isinstance(message, str):
+        data = json.loads(message)
+        if "x" in data and "y" in data:
+            # Newest command replaces any the control loop hasn't written yet
+            commands.put(data['x'], data['y'])
+    elif message[:1] == bytes([FRAME_COMMAND]) and len(message) == COMMAND_FRAME.size:
+        _, seq, sent, x, y = COMMAND_FRAME.unpack(message)
+        commands.put(x, y, ack=lambda: reply(PING_FRAME.pack(FRAME_ACK, seq, sent)))
+    elif message[:1] == bytes([FRAME_PING]) and len(message) == PING_FRAME.size:
+        commands.heard()
+        reply(message)
 
 def server(port=8008):
-    app = FastAPI()
+    peers = set()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await asyncio.gather(*(pc.close() for pc in list(peers)))
+
+    app = FastAPI(lifespan=lifespan)
 
     @app.get("/", response_class=HTMLResponse)
     async def root():
@@ -108,7 +365,7 @@ body {
   gap: 30px;
 }
 
-#feed {
+#feed, #video {
   max-height: 540px;
   max-width: 720px;
   border: 2px solid #333;
@@ -159,7 +416,8 @@ body {
   <h1 class="title">🤖 BracketBot Teleop Control</h1>
   
   <div class="main-content">
-    <img id="feed" src="/feed" alt="Camera Feed">
+    <img id="feed" alt="Camera Feed">
+    <video id="video" autoplay playsinline muted style="display: none"></video>
     
     <div class="joystick-container">
       <canvas id="joystick" width="240" height="240"></canvas>
@@ -169,11 +427,101 @@ body {
   <div class="info">
     <div>Linear: <span id="linear-speed" class="speed-value">0.00</span> m/s</div>
     <div>Angular: <span id="angular-speed" class="speed-value">0.00</span> rad/s</div>
+    <div>Latency: <span id="latency" class="speed-value">–</span></div>
+    <div>Video: <span id="video-settings" class="speed-value">–</span></div>
     <div class="controls-info">Click and drag the joystick to control the robot</div>
+    <div class="controls-info"><a id="transport-link" style="color: #888"></a></div>
   </div>
 </div>
 
 <script>
+// The feed id lets /stats report the quality this page's feed is adapted to
+const feedId = Math.random().toString(36).slice(2);
+// WebRTC video is opt-in with ?webrtc=1; anything going wrong falls back to the MJPEG /feed
+const WEBRTC_TIMEOUT_MS = 5000;
+let webrtc = new URLSearchParams(location.search).has("webrtc");
+let pc = null;
+let joystickChannel = null;
+
+const transportLink = document.getElementById("transport-link");
+transportLink.textContent = webrtc ? "Use MJPEG video" : "Try WebRTC video";
+transportLink.href = webrtc ? "?" : "?webrtc=1";
+
+function startFeed() {
+  webrtc = false;
+  joystickChannel = null;
+  if (pc) pc.close();
+  pc = null;
+  document.getElementById("video").style.display = "none";
+  const feed = document.getElementById("feed");
+  feed.style.display = "";
+  feed.src = "/feed?id=" + feedId;
+}
+
+async function startWebRTC() {
+  const video = document.getElementById("video");
+  // No ICE servers: the robot is reached on the local network
+  pc = new RTCPeerConnection();
+  pc.addTransceiver("video", { direction: "recvonly" });
+  const channel = pc.createDataChannel("joystick");
+  channel.binaryType = "arraybuffer";
+  channel.onmessage = (e) => onFrame(e.data);
+  channel.onopen = () => { joystickChannel = channel; };
+  channel.onclose = () => { if (joystickChannel === channel) joystickChannel = null; };
+  pc.ontrack = (e) => { video.srcObject = new MediaStream([e.track]); };
+  pc.onconnectionstatechange = () => {
+    console.log("[teleop] WebRTC", pc && pc.connectionState);
+    if (webrtc && pc && ["failed", "disconnected", "closed"].includes(pc.connectionState)) startFeed();
+  };
+  const timer = setTimeout(() => {
+    if (webrtc && !video.videoWidth) {
+      console.log("[teleop] No WebRTC video, falling back to /feed");
+      startFeed();
+    }
+  }, WEBRTC_TIMEOUT_MS);
+  try {
+    await pc.setLocalDescription(await pc.createOffer());
+    // Send the offer with all candidates, as the server doesn't trickle
+    await new Promise((resolve) => {
+      if (pc.iceGatheringState === "complete") return resolve();
+      pc.onicegatheringstatechange = () => { if (pc.iceGatheringState === "complete") resolve(); };
+    });
+    const response = await fetch("/offer", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ sdp: pc.localDescription.sdp, type: pc.localDescription.type }),
+    });
+    if (!response.ok) throw new Error(`offer rejected: ${response.status}`);
+    await pc.setRemoteDescription(await response.json());
+    document.getElementById("feed").style.display = "none";
+    video.style.display = "";
+  } catch (e) {
+    console.log("[teleop] WebRTC failed, falling back to /feed:", e);
+    clearTimeout(timer);
+    startFeed();
+  }
+}
+
+if (webrtc && window.RTCPeerConnection) startWebRTC(); else startFeed();
+
+async function updateVideoSettings() {
+  if (webrtc) {
+    const video = document.getElementById("video");
+    document.getElementById("video-settings").textContent = video.videoWidth
+      ? `WebRTC · ${video.videoWidth}×${video.videoHeight}` : "WebRTC connecting…";
+    return;
+  }
+  try {
+    const feed = (await (await fetch("/stats")).json()).feeds[feedId];
+    document.getElementById("video-settings").textContent = feed
+      ? `quality ${feed.quality} · ${Math.round(feed.scale * 100)}% · ${feed.fps.toFixed(0)} fps · ${feed.latency_ms.toFixed(0)} ms`
+      : "–";
+  } catch (e) {
+    document.getElementById("video-settings").textContent = "–";
+  }
+}
+setInterval(updateVideoSettings, 1000);
+
 const canvas = document.getElementById("joystick");
 const ctx = canvas.getContext("2d");
 const centerX = canvas.width / 2;
@@ -246,11 +594,52 @@ function sendCommand() {
   document.getElementById("linear-speed").textContent = (y * 1.2).toFixed(2);
   document.getElementById("angular-speed").textContent = (-x * 1.0).toFixed(2);
   
-  if (ws && ws.readyState === WebSocket.OPEN) {
-    ws.send(JSON.stringify({ x: -x, y: y }));
+  const frame = new DataView(new ArrayBuffer(COMMAND_FRAME_SIZE));
+  frame.setUint8(0, FRAME_COMMAND);
+  frame.setUint32(1, commandSeq++, true);
+  frame.setFloat64(5, performance.now(), true);
+  frame.setFloat32(13, -x, true);
+  frame.setFloat32(17, y, true);
+  sendFrame(frame.buffer);
+}
+
+// Binary frames, as teleop.py's COMMAND_FRAME and PING_FRAME
+const FRAME_COMMAND = 1, FRAME_PING = 2, FRAME_ACK = 3;
+const COMMAND_FRAME_SIZE = 21, PING_FRAME_SIZE = 13;
+// Pings also keep the server's deadman watchdog from stopping the robot while the joystick is held still
+const PING_INTERVAL_MS = 100;
+let commandSeq = 0;
+let pingSeq = 0;
+let pingRtt = null;
+let commandRtt = null;
+
+function sendFrame(buffer) {
+  if (joystickChannel && joystickChannel.readyState === "open") {
+    joystickChannel.send(buffer);
+  } else if (ws && ws.readyState === WebSocket.OPEN) {
+    ws.send(buffer);
   }
 }
 
+function onFrame(buffer) {
+  if (!(buffer instanceof ArrayBuffer) || buffer.byteLength !== PING_FRAME_SIZE) return;
+  const frame = new DataView(buffer);
+  const rtt = performance.now() - frame.getFloat64(5, true);
+  // Smooth a little so the display is readable
+  if (frame.getUint8(0) === FRAME_PING) pingRtt = pingRtt === null ? rtt : pingRtt + 0.2 * (rtt - pingRtt);
+  if (frame.getUint8(0) === FRAME_ACK) commandRtt = commandRtt === null ? rtt : commandRtt + 0.2 * (rtt - commandRtt);
+  document.getElementById("latency").textContent =
+    `ping ${pingRtt === null ? "–" : pingRtt.toFixed(1)} ms · command ${commandRtt === null ? "–" : commandRtt.toFixed(1)} ms`;
+}
+
+setInterval(() => {
+  const frame = new DataView(new ArrayBuffer(PING_FRAME_SIZE));
+  frame.setUint8(0, FRAME_PING);
+  frame.setUint32(1, pingSeq++, true);
+  frame.setFloat64(5, performance.now(), true);
+  sendFrame(frame.buffer);
+}, PING_INTERVAL_MS);
+
 canvas.addEventListener("mousedown", (e) => {
   isDragging = true;
   updatePosition(e.clientX, e.clientY);
@@ -297,6 +686,8 @@ canvas.addEventListener("touchend", (e) => {
 });
 
 const ws = new WebSocket((location.protocol === "https:" ? "wss://" : "ws://") + location.host + "/ws");
+ws.binaryType = "arraybuffer";
+ws.onmessage = (e) => onFrame(e.data);
 
 ws.onopen = () => {
   console.log("[teleop] WebSocket connected");
@@ -310,10 +701,18 @@ draw();
 </script>
 """)
 
+    @app.get("/stats")
+    async def stats():
+        return JSONResponse({
+            'command_latency': commands.percentiles(),
+            'feeds': {feed_id: client.settings() for feed_id, client in feed_clients.items()},
+        })
+
     @app.get("/feed")
-    async def feed():
+    async def feed(request: Request, id: str = ''):
+        client = FeedClient((request.scope['server'][1], request.client.port))
         return StreamingResponse(
-            generate_frames(),
+            generate_frames(client, id or str(request.client.port)),
             media_type="multipart/x-mixed-replace; boundary=frame",
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -324,51 +723,97 @@ draw();
             }
         )
     
-    async def generate_frames():
-        while not _stop:
-            try:
-                frame = jpeg_queue.get_nowait()
+    async def generate_frames(client, feed_id):
+        feed_clients[feed_id] = client
+        seen = 0
+        try:
+            while not _stop:
+                frame, seen = await feed_hub.next(client.level, seen)
+                if frame is None:
+                    continue
+                started = time.monotonic()
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-            except:
-                await asyncio.sleep(0.005)
+                await client.drain(len(frame))
+                client.sent(started)
+        finally:
+            if feed_clients.get(feed_id) is client:
+                del feed_clients[feed_id]
+
+    @app.post("/offer")
+    async def offer(request: Request):
+        """Answer a browser's WebRTC offer with the camera track and a joystick data channel.
+
+        No ICE servers are configured: the operator is expected on the
+        robot's network, and the page falls back to /feed otherwise.
+        """
+        params = await request.json()
+        pc = RTCPeerConnection(RTCConfiguration(iceServers=[]))  # aiortc would default to a public STUN server
+        peers.add(pc)
+        print("[teleop] WebRTC peer connecting")
+
+        loop = asyncio.get_running_loop()
+
+        @pc.on("datachannel")
+        def on_datachannel(channel):
+            def send(data):
+                if channel.readyState == "open":
+                    channel.send(data)
+
+            @channel.on("message")
+            def on_message(message):
+                joystick_command(message, lambda data: loop.call_soon_threadsafe(send, data))
+
+        @pc.on("connectionstatechange")
+        async def on_connectionstatechange():
+            print(f"[teleop] WebRTC connection {pc.connectionState}")
+            if pc.connectionState in ("failed", "closed"):
+                commands.put(0, 0)  # stop, as on a /ws disconnect
+                peers.discard(pc)
+                await pc.close()
+
+        try:
+            await pc.setRemoteDescription(RTCSessionDescription(sdp=params["sdp"], type=params["type"]))
+            pc.addTrack(CameraTrack())
+            await pc.setLocalDescription(await pc.createAnswer())
+        except Exception as e:
+            peers.discard(pc)
+            await pc.close()
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse({"sdp": pc.localDescription.sdp, "type": pc.localDescription.type})
 
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
         await websocket.accept()
         print("[teleop] WebSocket client connected")
-        
+        loop = asyncio.get_running_loop()
+        # Echoes and acks go through one queue so sends never interleave
+        outbox = asyncio.Queue()
+
+        def reply(data):
+            loop.call_soon_threadsafe(outbox.put_nowait, data)
+
+        async def sender():
+            while True:
+                await websocket.send_bytes(await outbox.get())
+
+        send_task = asyncio.create_task(sender())
         try:
             while not _stop:
-                try:
-                    message = await asyncio.wait_for(websocket.receive_text(), timeout=0.1)
-                    data = json.loads(message)
-                    
-                    if "x" in data and "y" in data:
-                        # Put command in queue for main thread
-                        cmd = {'x': data['x'], 'y': data['y']}
-                        try:
-                            cmd_queue.put_nowait(cmd)
-                        except queue.Full:
-                            # Remove old command and add new one
-                            try:
-                                cmd_queue.get_nowait()
-                            except queue.Empty:
-                                pass
-                            cmd_queue.put_nowait(cmd)
-                            
-                except asyncio.TimeoutError:
-                    continue
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                text = message.get("text")
+                joystick_command(message.get("bytes") if text is None else text, reply)
                     
         except WebSocketDisconnect:
             print("[teleop] WebSocket client disconnected")
             # Send stop command
-            try:
-                cmd_queue.put_nowait({'x': 0, 'y': 0})
-            except queue.Full:
-                pass
+            commands.put(0, 0)
         except Exception as e:
             print(f"[teleop] WebSocket error: {e}")
+        finally:
+            send_task.cancel()
 
     # Run the server
     uvicorn.run(app, host="0.0.0.0", port=port, log_level="error", 
@@ -376,9 +821,12 @@ draw();
 
 
 def main():
-    # Start reader loop thread
-    reader_thread = threading.Thread(target=reader_loop, daemon=True)
-    reader_thread.start()
+    global _stop
+    # Drive commands and JPEG encoding run on their own threads, so an encode never delays a command
+    threads = [threading.Thread(target=control_loop, daemon=True),
+               threading.Thread(target=encode_loop, daemon=True)]
+    for thread in threads:
+        thread.start()
     
     print("[teleop] Starting teleop control server on http://0.0.0.0:8008")
     print("[teleop] View interface at http://<robot-ip>:8008/")
@@ -388,7 +836,8 @@ def main():
     server(8008)
 
     _stop = True
-    reader_thread.join()
+    for thread in threads:
+        thread.join()
 
 
 if __name__ == "__main__":